@@ -19,7 +19,7 @@ from services.data_providers import (
     add_company_name_to_cache,
     remove_company_name_from_cache
 )
-from services.market_sentiment import calculate_market_sentiment, format_sentiment_message
+from services.market_sentiment import calculate_market_sentiment, format_sentiment_message, start_sentiment_refresher
 from utils.persistence import load_stock_list, save_stock_list
 
 
@@ -366,6 +366,9 @@ class InteractiveTelegramBot:
     def run(self):
         """Main bot loop"""
         self.running = True
+        # Warm the sentiment cache up front and keep it fresh in the
+        # background so /market answers from memory instead of 4 RTTs
+        start_sentiment_refresher()
         send_telegram_message("🤖 Interactive bot started! Send /help for commands.")
         
         print("🤖 Interactive Telegram bot listening for messages...")
@@ -379,13 +382,18 @@ class InteractiveTelegramBot:
                     for update in updates['result']:
                         if 'update_id' in update:
                             self.last_update_id = update['update_id']
-                        
+
                         if 'message' in update:
                             self.process_message(update['message'])
-                
-                # Short delay to prevent excessive API calls
-                time.sleep(1)
-                
+                    # No client-side delay needed on success: the long
+                    # poll in get_telegram_updates paces requests
+                    # server-side
+                elif updates is None:
+                    # get_telegram_updates swallows network errors and
+                    # returns None; back off so an outage doesn't turn
+                    # the loop into a zero-delay reconnect spin
+                    time.sleep(5)
+
             except KeyboardInterrupt:
                 print("\n🛑 Interactive bot stopped by user")
                 break
@@ -4,6 +4,13 @@ Telegram client module for sending messages and media
 import requests
 from config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
 
+# One pooled session shared by the alert and interactive paths: every
+# message rides an existing keep-alive connection to api.telegram.org
+# instead of paying a fresh TCP+TLS handshake per call
+_SESSION = requests.Session()
+_SESSION.mount('https://', requests.adapters.HTTPAdapter(
+    pool_connections=4, pool_maxsize=16))
+
 
 def send_telegram_message(message: str):
     """Send text message to Telegram chat"""
@@ -17,7 +24,7 @@ def send_telegram_message(message: str):
     }
 
     try:
-        response = requests.post(url, data=payload)
+        response = _SESSION.post(url, data=payload)
         response.raise_for_status()
         print("Message sent:", response.json())
         return response.json()
@@ -34,7 +41,7 @@ def send_telegram_message(message: str):
             }
             
             try:
-                response = requests.post(url, data=payload_plain)
+                response = _SESSION.post(url, data=payload_plain)
                 response.raise_for_status()
                 print("Message sent (plain text):", response.json())
                 return response.json()
@@ -46,7 +53,7 @@ def send_telegram_message(message: str):
                     "chat_id": TELEGRAM_CHAT_ID,
                     "text": f"⚠️ Message formatting error. Shortened message:\n\n{short_message}"
                 }
-                response = requests.post(url, data=payload_short)
+                response = _SESSION.post(url, data=payload_short)
                 return response.json()
         else:
             raise e
@@ -65,7 +72,7 @@ def send_telegram_photo(image_path: str, caption: str = ""):
                 'parse_mode': 'Markdown'
             }
             
-            response = requests.post(url, files=files, data=data)
+            response = _SESSION.post(url, files=files, data=data)
             response.raise_for_status()
             print(f"📸 Image sent: {response.json()}")
             return True
@@ -74,17 +81,24 @@ def send_telegram_photo(image_path: str, caption: str = ""):
         return False
 
 
-def get_telegram_updates(offset: int = 0):
-    """Get new messages from Telegram"""
+def get_telegram_updates(offset: int = 0, timeout: int = 25):
+    """Get new messages from Telegram via long polling
+
+    Telegram holds the connection open up to `timeout` seconds and
+    answers the moment an update exists, so an idle bot makes a couple
+    of requests per minute instead of one per second. The client read
+    timeout stays above the server-side timeout so the poll isn't
+    aborted from our end.
+    """
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/getUpdates"
     payload = {
         "offset": offset,
-        "timeout": 10,
+        "timeout": timeout,
         "allowed_updates": ["message"]
     }
     
     try:
-        response = requests.get(url, params=payload, timeout=15)
+        response = _SESSION.get(url, params=payload, timeout=timeout + 5)
         response.raise_for_status()
         return response.json()
     except Exception as e:
@@ -92,6 +106,35 @@ def get_telegram_updates(offset: int = 0):
         return None
 
 
+def set_telegram_webhook(webhook_url: str, secret_token: str = None) -> bool:
+    """Point Telegram at a webhook URL instead of polling"""
+    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/setWebhook"
+    payload = {"url": webhook_url, "allowed_updates": ["message"]}
+    if secret_token:
+        payload["secret_token"] = secret_token
+    
+    try:
+        response = _SESSION.post(url, data=payload, timeout=10)
+        response.raise_for_status()
+        print(f"✅ Webhook set: {webhook_url}")
+        return True
+    except Exception as e:
+        print(f"❌ Error setting webhook: {e}")
+        return False
+
+
+def delete_telegram_webhook() -> bool:
+    """Remove the webhook so getUpdates polling works again"""
+    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/deleteWebhook"
+    try:
+        response = _SESSION.post(url, timeout=10)
+        response.raise_for_status()
+        return True
+    except Exception as e:
+        print(f"⚠️ Error deleting webhook: {e}")
+        return False
+
+
 def delete_telegram_message(message_id: int):
     """Delete a specific message from Telegram chat"""
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/deleteMessage"
@@ -101,7 +144,7 @@ def delete_telegram_message(message_id: int):
     }
     
     try:
-        response = requests.post(url, data=payload, timeout=5)
+        response = _SESSION.post(url, data=payload, timeout=5)
         return response.status_code == 200
     except Exception:
         return False
@@ -137,7 +180,7 @@ def clear_chat_history(max_messages: int = 50):
             try:
                 url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/deleteMessage"
                 payload = {"chat_id": TELEGRAM_CHAT_ID, "message_id": message_id}
-                response = requests.post(url, data=payload, timeout=5)
+                response = _SESSION.post(url, data=payload, timeout=5)
                 
                 if response.status_code == 200:
                     deleted_count += 1
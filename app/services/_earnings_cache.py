@@ -0,0 +1,56 @@
+"""
+Small disk cache for the full FMP earnings calendar
+Keyed on the requested date window so repeat runs skip the network fetch
+"""
+import hashlib
+import json
+import os
+import time
+
+# Cache TTL in seconds (default 1 hour), configurable via environment
+CACHE_TTL = int(os.getenv('EARNINGS_CACHE_TTL', '3600'))
+
+_CACHE_DIR = os.path.join('.cache', 'earnings')
+
+
+def _cache_path(key: str) -> str:
+    """Map a cache key to its on-disk JSON file"""
+    digest = hashlib.md5(key.encode('utf-8')).hexdigest()
+    return os.path.join(_CACHE_DIR, f"{digest}.json")
+
+
+def load(key: str, ttl: int = None):
+    """Return cached data for key if fresh, else None"""
+    if ttl is None:
+        ttl = CACHE_TTL
+
+    path = _cache_path(key)
+    try:
+        if not os.path.exists(path):
+            return None
+
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+
+        fetched_at = payload.get('fetched_at', 0)
+        if time.time() - fetched_at > ttl:
+            return None  # Stale - caller should refetch
+
+        return payload.get('data')
+    except Exception as e:
+        print(f"⚠️ Error reading earnings cache {path}: {e}")
+        return None
+
+
+def store(key: str, data) -> bool:
+    """Write data to the cache with a fresh timestamp"""
+    path = _cache_path(key)
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        payload = {'fetched_at': time.time(), 'data': data}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+        return True
+    except Exception as e:
+        print(f"⚠️ Error writing earnings cache {path}: {e}")
+        return False
@@ -2,9 +2,62 @@
 Hybrid data providers: FMP primary, Yahoo secondary, mock fallback
 Provides intelligent fallback chain for maximum reliability
 """
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeout
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
+
+import numpy as np
+
+# Per-provider timeout budget (seconds). Bounds how long a single upstream
+# call may spend actively working so one slow symbol cannot hang a whole
+# batch. Rate-limiter waits and retry backoffs do not count against the
+# budget (see _timed), so a provider pacing itself - e.g. Yahoo's bucket
+# refilling at one token per 20s - is not mistaken for a hung request.
+QUOTE_TIMEOUT = 3.0
+HISTORY_TIMEOUT = 8.0
+
+_shared_pool = ThreadPoolExecutor(max_workers=16)
+
+
+def _timed(fn, timeout, *args, **kwargs):
+    """Run fn in the shared pool and raise TimeoutError if it exceeds the budget
+
+    The budget covers active time only: sleeps the providers route
+    through pacing.pause (limiter deficits, 429/backoff waits) extend
+    the deadline, so a cold quote that has to wait out the rate limiter
+    still completes instead of being abandoned in favor of mock data.
+    """
+    worker_ident: List[int] = []
+
+    def _run():
+        worker_ident.append(threading.get_ident())
+        _pacing_reset()  # pool threads are reused; drop any stale ledger
+        return fn(*args, **kwargs)
+
+    future = _shared_pool.submit(_run)
+    start = time.monotonic()
+    while True:
+        paused = _paced_seconds(worker_ident[0]) if worker_ident else 0.0
+        remaining = timeout + paused - (time.monotonic() - start)
+        try:
+            return future.result(timeout=max(remaining, 0.25))
+        except FuturesTimeout:
+            now_paused = _paced_seconds(worker_ident[0]) if worker_ident else 0.0
+            if now_paused > paused:
+                continue  # the worker was pacing, not stuck - extend the deadline
+            future.cancel()
+            raise TimeoutError(f"{getattr(fn, '__name__', fn)} exceeded {timeout}s budget")
+
+# Pacing ledger: providers record limiter/backoff sleeps here so _timed
+# can tell deliberate pacing apart from a hung request
+try:
+    from .pacing import paced_seconds as _paced_seconds, reset as _pacing_reset
+except ImportError:
+    # Fallback for direct execution
+    from pacing import paced_seconds as _paced_seconds, reset as _pacing_reset
 
 # Import hybrid FMP + Yahoo system
 try:
@@ -73,11 +126,10 @@ def create_mock_quote(symbol: str) -> Dict:
     }
 
 
-def get_mock_historical_data(symbol: str, days: int = 250, period: str = None) -> Tuple[List[float], List[str], List[Dict]]:
+def get_mock_historical_data(symbol: str, days: int = 250, period: str = None) -> Tuple[np.ndarray, List[str], List[Dict]]:
     """Generate realistic mock historical data"""
     import random
     import pandas as pd
-    import numpy as np
     
     # Determine number of days
     if period:
@@ -133,16 +185,53 @@ def get_mock_historical_data(symbol: str, days: int = 250, period: str = None) -
             'volume': volume
         })
     
-    return prices, date_list, historical_data
+    # Return a float64 buffer directly - indicator code consumes arrays, not lists
+    return np.asarray(prices, dtype=np.float64), date_list, historical_data
+
+
+# Single-flight guard: concurrent callers for the same symbol (e.g. dividend
+# loop + alert loop firing at the same second) wait on one in-flight fetch
+# instead of each hitting the upstream APIs.
+_inflight: Dict[str, threading.Event] = {}
+_inflight_result: Dict[str, Any] = {}
+_inflight_lock = threading.Lock()
 
 
 def get_stock_quote(symbol: str) -> Optional[Dict]:
+    """Get current stock quote - deduplicates concurrent fetches for the same symbol"""
+    key = symbol.upper()
+
+    with _inflight_lock:
+        event = _inflight.get(key)
+        if event is not None:
+            # Another thread is already fetching this symbol - wait for its result
+            leader = False
+        else:
+            event = threading.Event()
+            _inflight[key] = event
+            leader = True
+
+    if not leader:
+        event.wait()
+        return _inflight_result.get(key)
+
+    try:
+        quote = _fetch_stock_quote(symbol)
+        _inflight_result[key] = quote
+        return quote
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        event.set()
+
+
+def _fetch_stock_quote(symbol: str) -> Optional[Dict]:
     """Get current stock quote - uses hybrid FMP (primary) + Yahoo (fallback), then mock data"""
-    
+
     if HYBRID_AVAILABLE:
         try:
             print(f"📊 Getting quote for {symbol} via Hybrid (FMP primary, Yahoo fallback)...")
-            quote = get_hybrid_stock_quote(symbol)
+            quote = _timed(get_hybrid_stock_quote, QUOTE_TIMEOUT, symbol)
             
             if quote and quote.get('price', 0) > 0:
                 source = quote.get('source', 'hybrid')
@@ -153,26 +242,31 @@ def get_stock_quote(symbol: str) -> Optional[Dict]:
                 
         except Exception as e:
             print(f"⚠️ Hybrid API failed for {symbol}: {e}")
-    else:
-        try:
-            print(f"📊 Getting quote for {symbol} via Direct Yahoo API...")
-            quote = get_yahoo_quote(symbol)
-            
-            if quote and quote.get('price', 0) > 0:
-                print(f"✅ Real data for {symbol}: ${quote['price']:.2f}")
-                return quote
-            else:
-                raise Exception("No valid quote data returned")
-                
-        except Exception as e:
-            print(f"⚠️ Direct API failed for {symbol}: {e}")
+
+    # Hybrid unavailable or timed out/failed - try Yahoo direct within budget
+    try:
+        print(f"📊 Getting quote for {symbol} via Direct Yahoo API...")
+        quote = _timed(get_yahoo_quote, QUOTE_TIMEOUT, symbol)
+
+        if quote and quote.get('price', 0) > 0:
+            print(f"✅ Real data for {symbol}: ${quote['price']:.2f}")
+            return quote
+        else:
+            raise Exception("No valid quote data returned")
+
+    except Exception as e:
+        print(f"⚠️ Direct API failed for {symbol}: {e}")
     
     print(f"🎭 Using mock quote data for {symbol}")
     return create_mock_quote(symbol)
 
 
-def get_historical_prices(symbol: str, days: int = 250, period: str = None) -> Tuple[List[float], List[str], List[Dict]]:
-    """Get historical prices - uses hybrid FMP (primary) + Yahoo (fallback), then mock data"""
+def get_historical_prices(symbol: str, days: int = 250, period: str = None) -> Tuple[np.ndarray, List[str], List[Dict]]:
+    """Get historical prices - uses hybrid FMP (primary) + Yahoo (fallback), then mock data
+
+    Prices are returned as a float64 NumPy array so downstream indicator code
+    (moving averages, RSI) can operate on the buffer without a list round-trip.
+    """
     
     # Convert days to period if needed
     if period is None:
@@ -196,23 +290,23 @@ def get_historical_prices(symbol: str, days: int = 250, period: str = None) -> T
         try:
             print(f"📊 Getting {period} historical data for {symbol} via Hybrid (FMP primary, Yahoo fallback)...")
             from .fmp_hybrid import get_hybrid_stock_history
-            result = get_hybrid_stock_history(symbol, period)
+            result = _timed(get_hybrid_stock_history, HISTORY_TIMEOUT, symbol, period)
             
-            if result and result.get('prices') and len(result['prices']) > 0:
+            if result and result.get('prices') is not None and len(result['prices']) > 0:
                 print(f"✅ Hybrid historical data ({result.get('source', 'unknown')}): {len(result['prices'])} points for {symbol}")
-                return result['prices'], result['dates'], result['historical_data']
+                return np.asarray(result['prices'], dtype=np.float64), result['dates'], result['historical_data']
         except Exception as e:
             print(f"⚠️ Hybrid historical failed for {symbol}: {e}")
     
     # Fallback to Yahoo direct
     try:
         print(f"📊 Trying Yahoo direct for {period} historical data for {symbol}...")
-        result = get_yahoo_history(symbol, period)
+        result = _timed(get_yahoo_history, HISTORY_TIMEOUT, symbol, period)
         
         if result and len(result[0]) > 0:
             prices, dates, historical_data = result
             print(f"✅ Real historical data: {len(prices)} points for {symbol}")
-            return prices, dates, historical_data
+            return np.asarray(prices, dtype=np.float64), dates, historical_data
         else:
             raise Exception("No valid historical data returned")
             
@@ -222,6 +316,12 @@ def get_historical_prices(symbol: str, days: int = 250, period: str = None) -> T
         return get_mock_historical_data(symbol, days, period)
 
 
+def get_historical_prices_list(symbol: str, days: int = 250, period: str = None) -> Tuple[List[float], List[str], List[Dict]]:
+    """Legacy shim: same as get_historical_prices but with prices as a Python list"""
+    prices, dates, historical_data = get_historical_prices(symbol, days, period)
+    return prices.tolist(), dates, historical_data
+
+
 def get_stock_interval_data(symbol: str, interval_minutes: int = None):
     """Get stock data with configurable interval - returns format compatible with alerts"""
     
@@ -314,7 +414,7 @@ def get_multiple_stock_quotes(symbols: List[str], use_smart_delays: bool = True)
             return get_quotes_with_smart_delays(symbols)
         else:
             print(f"📊 Using simple processing for {len(symbols)} stocks...")
-            return get_multiple_quotes(symbols, use_delays=True)
+            return get_multiple_quotes(symbols)
             
     except Exception as e:
         print(f"❌ Error in batch quote processing: {e}")
@@ -371,7 +471,7 @@ def test_data_providers_connectivity() -> Dict:
         # Test historical data
         print("🧪 Testing historical data connectivity...")
         prices, dates, data = get_historical_prices('AAPL', days=30)
-        if prices and len(prices) > 0:
+        if prices is not None and len(prices) > 0:
             results['historical_test'] = f"{len(prices)} data points from {dates[0] if dates else 'N/A'}"
             print(f"✅ Historical test successful: {results['historical_test']}")
         else:
@@ -404,5 +504,5 @@ if __name__ == "__main__":
     # Test history  
     print(f"\n🧪 Testing historical data...")
     prices, dates, data = get_historical_prices("AAPL", period="1mo")
-    if prices:
+    if len(prices) > 0:
         print(f"✅ History: {len(prices)} data points from {dates[0]} to {dates[-1]}")
\ No newline at end of file
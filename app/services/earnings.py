@@ -5,7 +5,32 @@ Earnings service module for financial market updates using rate-limited Yahoo Fi
 import json
 import os
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import date, timedelta, datetime
+from functools import lru_cache
+from operator import attrgetter
+
+# orjson is 2-5x faster for JSON parse/dump; fall back to stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_loads(data):
+    """Parse JSON bytes/str with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize to JSON bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
 
 # Import hybrid FMP + Yahoo functions for better reliability
 try:
@@ -20,47 +45,150 @@ try:
 except ImportError:
     from yahoo_direct import get_yahoo_earnings_calendar, get_yahoo_quote
 
+def _first_import(module_names, attr_names):
+    """Import the first resolvable module and return the requested attributes
+
+    Avoids the repeated fail-and-retry ImportError unwinding of chained
+    try/except imports when this module loads in a long-lived worker.
+    """
+    import importlib
+    for name in module_names:
+        try:
+            module = importlib.import_module(name, package=__package__ or None)
+            return tuple(getattr(module, a) for a in attr_names)
+        except Exception:
+            continue
+    return None
+
+
 # Handle config import with fallback
-try:
-    from config import STOCKS_TO_CHECK, EARNINGS_DAYS_AHEAD
-except ImportError:
-    try:
-        from ..config import STOCKS_TO_CHECK, EARNINGS_DAYS_AHEAD
-    except ImportError:
-        # Fallback to default stocks if config not available
-        STOCKS_TO_CHECK = ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA"]
-        EARNINGS_DAYS_AHEAD = 14
+_config = _first_import(['config', '..config'], ['STOCKS_TO_CHECK', 'EARNINGS_DAYS_AHEAD'])
+if _config:
+    STOCKS_TO_CHECK, EARNINGS_DAYS_AHEAD = _config
+else:
+    # Fallback to default stocks if config not available
+    STOCKS_TO_CHECK = ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA"]
+    EARNINGS_DAYS_AHEAD = 14
+
+# Uppercased watchlist computed once at import - used for calendar filtering
+_WATCHLIST_UPPER = frozenset(s.upper() for s in STOCKS_TO_CHECK)
+
+# Always fetch at least this many days of calendar so runs with different
+# days_to_check share one cached fetch per day instead of each hitting FMP
+_FETCH_WINDOW_DAYS = 60
 
 # Handle telegram client import
-try:
-    from core.telegram_client import send_telegram_message
-except ImportError:
+_telegram = _first_import(['core.telegram_client', '..core.telegram_client'],
+                          ['send_telegram_message'])
+if _telegram:
+    (send_telegram_message,) = _telegram
+else:
+    # Fallback if telegram not available
+    def send_telegram_message(msg):
+        print(f"📱 [TELEGRAM]: {msg}")
+
+
+# Company names change essentially never, so they are cached on disk and
+# consulted before any quote fetch in the notification path
+_COMPANY_NAME_CACHE_PATH = os.path.join('.cache', 'company_names.json')
+_company_name_cache = None
+
+
+def _load_company_names():
+    """Load the persistent symbol -> company name cache (lazily, once)"""
+    global _company_name_cache
+    if _company_name_cache is None:
+        try:
+            with open(_COMPANY_NAME_CACHE_PATH, 'rb') as f:
+                _company_name_cache = _json_loads(f.read())
+        except FileNotFoundError:
+            _company_name_cache = {}
+        except Exception as e:
+            print(f"⚠️ Error loading company name cache: {e}")
+            _company_name_cache = {}
+    return _company_name_cache
+
+
+def _save_company_names():
+    """Persist the company name cache to disk"""
     try:
-        from ..core.telegram_client import send_telegram_message
-    except ImportError:
-        # Fallback if telegram not available
-        def send_telegram_message(msg):
-            print(f"📱 [TELEGRAM]: {msg}")
+        os.makedirs(os.path.dirname(_COMPANY_NAME_CACHE_PATH), exist_ok=True)
+        with open(_COMPANY_NAME_CACHE_PATH, 'wb') as f:
+            f.write(_json_dumps(_company_name_cache))
+    except Exception as e:
+        print(f"⚠️ Error saving company name cache: {e}")
 
 
 def get_log(file_log_name):
-    """Get log file of processed events"""
+    """Get log of processed events as a set of keys
+
+    The log is stored one key per line so new events can be appended without
+    rewriting the whole file. Legacy JSON-list logs are migrated on load.
+    """
     try:
-        if os.path.exists(file_log_name):
-            return json.load(open(file_log_name, "r", encoding="utf-8"))
-        else:
-            return []
+        if not os.path.exists(file_log_name):
+            return set()
+
+        with open(file_log_name, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        if content.lstrip().startswith('['):
+            # Legacy JSON list format - migrate to line-per-key once
+            keys = set(_json_loads(content))
+            with open(file_log_name, "w", encoding="utf-8") as f:
+                f.write("\n".join(sorted(keys)) + "\n" if keys else "")
+            return keys
+
+        return set(line for line in content.splitlines() if line)
     except Exception as e:
         print(f"⚠️ Error loading log {file_log_name}: {e}")
-        return []
+        return set()
 
 
-def get_earnings_calendar(days_to_check=7):
-    """Get earnings calendar for monitored stocks using hybrid FMP + Yahoo APIs"""
+def append_to_log(file_log_name, key):
+    """Append a single processed-event key to the log file"""
+    try:
+        with open(file_log_name, "a", encoding="utf-8") as f:
+            f.write(key + "\n")
+    except Exception as e:
+        print(f"⚠️ Error appending to log {file_log_name}: {e}")
+
+
+@dataclass(slots=True)
+class EarningsEntry:
+    """One upcoming earnings event - slots keep hundreds of entries cheap"""
+    symbol: str
+    date: date
+    days_until: int
+    timestamp: object = None
+    eps_estimated: object = None
+    source: str = 'unknown'
+
+
+def _fetch_yahoo_earnings(symbol):
+    """Fetch Yahoo earnings calendar for one symbol, swallowing errors to None"""
+    try:
+        return get_yahoo_earnings_calendar(symbol)
+    except Exception as e:
+        print(f"⚠️ Yahoo earnings fetch failed for {symbol}: {e}")
+        return None
+
+
+def get_earnings_calendar(days_to_check=7, known_keys=None):
+    """Get earnings calendar for monitored stocks using hybrid FMP + Yahoo APIs
+
+    known_keys: optional set of already-alerted event keys; matching entries
+    are skipped before any per-entry work (date parsing, quote lookups).
+    """
+    if not _WATCHLIST_UPPER:
+        return []  # Nothing to check - skip the calendar fetch entirely
+
     print(f"Getting earnings calendar for {len(STOCKS_TO_CHECK)} stocks (hybrid FMP + Yahoo)")
     
     all_earnings = []
+    seen_keys = set()  # Dedupe repeated (symbol, date) rows from the calendar
     today = date.today()
+    today_ord = today.toordinal()  # Date diffs below become int subtraction
     
     # OPTIMIZATION: Fetch full earnings calendar ONCE instead of per-symbol
     full_calendar = None
@@ -68,60 +196,97 @@ def get_earnings_calendar(days_to_check=7):
     
     if HYBRID_EARNINGS_AVAILABLE:
         try:
-            print(f"🔵 Fetching full FMP earnings calendar once for all stocks...")
+            fetch_window = max(days_to_check * 2, _FETCH_WINDOW_DAYS)
             from_date = today.strftime('%Y-%m-%d')
-            to_date = (today + timedelta(days=days_to_check*2)).strftime('%Y-%m-%d')
-            
-            from .fmp_hybrid import _make_fmp_request, FMP_ENABLED
-            if FMP_ENABLED:
-                cal_url = 'https://financialmodelingprep.com/api/v3/earning_calendar'
-                full_calendar = _make_fmp_request(cal_url, {'from': from_date, 'to': to_date})
-                if full_calendar:
-                    calendar_source = 'fmp'
-                    print(f"✅ FMP returned {len(full_calendar)} total earnings entries")
-                else:
-                    print(f"⚠️ FMP returned empty earnings calendar")
+            to_date = (today + timedelta(days=fetch_window)).strftime('%Y-%m-%d')
+
+            # Check the disk cache first - the full calendar barely changes
+            # within an hour, so repeat runs skip the network fetch entirely
+            from . import _earnings_cache
+            cache_key = f"{from_date}_{to_date}"
+            full_calendar = _earnings_cache.load(cache_key)
+            if full_calendar:
+                calendar_source = 'fmp'
+                print(f"📦 Using cached FMP earnings calendar ({len(full_calendar)} entries)")
+            else:
+                print(f"🔵 Fetching full FMP earnings calendar once for all stocks...")
+                from .fmp_hybrid import _make_fmp_request, FMP_ENABLED
+                if FMP_ENABLED:
+                    cal_url = 'https://financialmodelingprep.com/api/v3/earning_calendar'
+                    full_calendar = _make_fmp_request(cal_url, {'from': from_date, 'to': to_date})
+                    if full_calendar:
+                        calendar_source = 'fmp'
+                        print(f"✅ FMP returned {len(full_calendar)} total earnings entries")
+                        _earnings_cache.store(cache_key, full_calendar)
+                    else:
+                        print(f"⚠️ FMP returned empty earnings calendar")
         except Exception as e:
             print(f"⚠️ Error fetching FMP earnings calendar: {e}")
-    
-    for symbol in STOCKS_TO_CHECK:
+
+    # Index the calendar once by symbol, dropping entries outside the
+    # watchlist in the same pass - the full calendar has thousands of rows
+    # but we only ever look at the watched symbols, so there is no point
+    # materializing an index (or keeping the raw list) for the rest
+    by_symbol = defaultdict(list)
+    had_calendar = bool(full_calendar)
+    if full_calendar:
+        for entry in full_calendar:
+            sym = (entry.get('symbol') or '').upper()
+            if sym in _WATCHLIST_UPPER:
+                by_symbol[sym].append(entry)
+        full_calendar = None  # Free the raw list - only the filtered index is needed
+
+    # FMP failed entirely - prefetch all Yahoo fallbacks concurrently instead
+    # of paying one serial HTTP round-trip per symbol inside the loop
+    yahoo_results = {}
+    if not had_calendar and STOCKS_TO_CHECK:
+        print(f"🔄 Prefetching Yahoo earnings for {len(STOCKS_TO_CHECK)} stocks in parallel...")
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {executor.submit(_fetch_yahoo_earnings, s): s for s in STOCKS_TO_CHECK}
+            for future in as_completed(futures):
+                yahoo_results[futures[future]] = future.result()
+
+    # When FMP answered, it is the ground truth: symbols absent from the
+    # calendar simply have no earnings in the window, so only iterate the
+    # symbols that actually appear instead of building empty entries
+    if had_calendar and calendar_source == 'fmp':
+        symbols_to_process = [s for s in STOCKS_TO_CHECK if s.upper() in by_symbol]
+        skipped = len(STOCKS_TO_CHECK) - len(symbols_to_process)
+        if skipped:
+            print(f"ℹ️ {skipped} watched symbols have no FMP earnings in the window - skipped")
+    else:
+        symbols_to_process = STOCKS_TO_CHECK
+
+    for symbol in symbols_to_process:
+        symbol_upper = symbol.upper()
         try:
             print(f"📊 Checking earnings for {symbol}...")
-            
+
             earnings_data = None
-            
+
             # Use cached full calendar if available
-            if full_calendar and calendar_source == 'fmp':
-                # Filter for this specific symbol
-                symbol_earnings = [e for e in full_calendar if e.get('symbol', '').upper() == symbol.upper()]
-                
-                if symbol_earnings:
-                    earnings_data = {
-                        'symbol': symbol.upper(),
-                        'upcoming_earnings': [
-                            {
-                                'date': earning.get('date'),
-                                'eps_estimated': earning.get('epsEstimated'),
-                                'revenue_estimated': earning.get('revenueEstimated'),
-                                'time': earning.get('time')
-                            }
-                            for earning in symbol_earnings
-                        ],
-                        'source': 'fmp'
-                    }
-                    print(f"✅ Found {len(symbol_earnings)} FMP earnings entries for {symbol}")
-                else:
-                    print(f"ℹ️ No FMP earnings for {symbol} in next {days_to_check*2} days")
-                    earnings_data = {
-                        'symbol': symbol.upper(),
-                        'upcoming_earnings': [],
-                        'source': 'fmp'
-                    }
-            
-            # Fallback to Yahoo if no FMP data
+            if had_calendar and calendar_source == 'fmp':
+                # Look up this symbol in the pre-built index
+                symbol_earnings = by_symbol[symbol_upper]
+                earnings_data = {
+                    'symbol': symbol_upper,
+                    'upcoming_earnings': [
+                        {
+                            'date': earning.get('date'),
+                            'eps_estimated': earning.get('epsEstimated'),
+                            'revenue_estimated': earning.get('revenueEstimated'),
+                            'time': earning.get('time')
+                        }
+                        for earning in symbol_earnings
+                    ],
+                    'source': 'fmp'
+                }
+                print(f"✅ Found {len(symbol_earnings)} FMP earnings entries for {symbol}")
+
+            # Fallback to Yahoo if no FMP data (prefetched concurrently above)
             if not earnings_data:
                 print(f"🔄 Using Yahoo fallback for {symbol}")
-                earnings_data = get_yahoo_earnings_calendar(symbol)
+                earnings_data = yahoo_results.get(symbol)
             
             if not earnings_data:
                 print(f"⚠️ No earnings data found for {symbol}")
@@ -134,20 +299,30 @@ def get_earnings_calendar(days_to_check=7):
                 earnings_date_str = earnings_info.get('date')
                 if earnings_date_str:
                     try:
-                        earnings_date = datetime.strptime(earnings_date_str, '%Y-%m-%d').date()
-                        date_diff = abs((earnings_date - today).days)
-                        
+                        # fromisoformat is C-implemented and much faster than strptime
+                        earnings_date = date.fromisoformat(earnings_date_str)
+                        days_until = earnings_date.toordinal() - today_ord
+                        date_diff = abs(days_until)
+
                         print(f"🔍 {symbol}: Earnings on {earnings_date} is {date_diff} days away (threshold: {days_to_check} days)")
-                        
+
                         if date_diff <= days_to_check:
-                            earnings_entry = {
-                                'symbol': symbol,
-                                'date': earnings_date,
-                                'days_until': (earnings_date - today).days,
-                                'timestamp': earnings_info.get('timestamp'),
-                                'eps_estimated': earnings_info.get('eps_estimated'),
-                                'source': earnings_data.get('source', 'unknown')
-                            }
+                            # Skip duplicates and already-alerted events before
+                            # building the entry (same key as the notifier's)
+                            earning_key = f"{symbol}_{earnings_date}_expected"
+                            if earning_key in seen_keys:
+                                continue
+                            if known_keys and earning_key in known_keys:
+                                continue
+                            seen_keys.add(earning_key)
+                            earnings_entry = EarningsEntry(
+                                symbol=symbol,
+                                date=earnings_date,
+                                days_until=days_until,
+                                timestamp=earnings_info.get('timestamp'),
+                                eps_estimated=earnings_info.get('eps_estimated'),
+                                source=earnings_data.get('source', 'unknown')
+                            )
                             all_earnings.append(earnings_entry)
                             print(f"✅ Found upcoming earnings for {symbol} on {earnings_date} ({date_diff} days away)")
                     except ValueError as e:
@@ -159,44 +334,87 @@ def get_earnings_calendar(days_to_check=7):
             print(f"❌ Error getting earnings for {symbol}: {e}")
             continue
     
-    # Sort by date
-    all_earnings.sort(key=lambda x: x['date'])
-    
+    # Sort by date (attrgetter is C-implemented, cheaper than a lambda)
+    all_earnings.sort(key=attrgetter('date'))
+
     return all_earnings
 
 
+@lru_cache(maxsize=1024)
+def _fmt_date(d):
+    """Format a date for display - cached since many earnings share a date"""
+    return d.strftime('%B %d, %Y')
+
+
+# Telegram caps messages at 4096 chars; leave headroom for markdown
+_TELEGRAM_CHUNK_SIZE = 3900
+
+
+def _chunk_by_size(text, limit=_TELEGRAM_CHUNK_SIZE):
+    """Split text into chunks under limit, breaking on newlines where possible"""
+    chunks = []
+    while len(text) > limit:
+        cut = text.rfind('\n', 0, limit)
+        if cut <= 0:
+            cut = limit
+        chunks.append(text[:cut])
+        text = text[cut:].lstrip('\n')
+    if text:
+        chunks.append(text)
+    return chunks
+
+
 def run_and_notify_earnings_calendar():
     """Run earnings calendar check and send telegram notification if new earnings found"""
-    earnings = get_earnings_calendar(days_to_check=EARNINGS_DAYS_AHEAD)
     file_log_name = 'earnings_calendar_log.txt'
     earnings_log = get_log(file_log_name)
-    
+    # Passing the log lets the calendar skip already-alerted events early
+    earnings = get_earnings_calendar(days_to_check=EARNINGS_DAYS_AHEAD, known_keys=earnings_log)
+
+    # Prefetch quotes in one batch, but only for symbols whose company name
+    # is not already in the persistent cache - after the first warm-up run
+    # this usually means zero HTTP calls
+    quotes = {}
+    company_names = _load_company_names()
+    unique_symbols = sorted({e.symbol for e in earnings})
+    uncached_symbols = [s for s in unique_symbols if s.upper() not in company_names]
+    if uncached_symbols:
+        try:
+            from .data_providers import get_multiple_stock_quotes
+            quotes = get_multiple_stock_quotes(uncached_symbols)
+        except Exception as e:
+            print(f"⚠️ Batch quote prefetch failed: {e}")
+
+    names_dirty = False
+    pending_messages = []  # Coalesced into one Telegram send after the loop
+    new_keys = []  # Persisted only once the grouped send succeeds
+
     for earning in earnings:
         try:
             # Create unique key for this earning event
-            earning_key = f"{earning['symbol']}_{earning['date']}_{earning.get('epsActual', 'expected')}"
+            earning_key = f"{earning.symbol}_{earning.date}_expected"
             
-            # Check if we've already alerted about this earning
+            # Check if we've already alerted about this earning (O(1) set lookup)
             if earning_key in earnings_log:
                 continue
-                
+
             # Add to log
-            earnings_log.append(earning_key)
+            earnings_log.add(earning_key)
             
             # Determine timing and create appropriate message
-            days_until = earning.get('days_until', 0)
-            symbol = earning['symbol']
-            date_str = earning['date'].strftime('%B %d, %Y')
+            days_until = earning.days_until
+            symbol = earning.symbol
+            date_str = _fmt_date(earning.date)
             
-            # Fetch company name for better display
-            try:
-                from .data_providers import get_stock_quote
-                quote = get_stock_quote(symbol)
+            # Company name: persistent cache first, then the prefetched quotes
+            company_name = company_names.get(symbol.upper())
+            if not company_name:
+                quote = quotes.get(symbol) or quotes.get(symbol.upper())
                 company_name = quote.get('companyName', symbol) if quote else symbol
-                stock_display = f"{symbol} ({company_name})" if company_name and company_name != symbol else symbol
-            except Exception as e:
-                print(f"⚠️ Could not fetch company name for {symbol}: {e}")
-                stock_display = symbol
+                if company_name and company_name != symbol:
+                    company_names[symbol.upper()] = company_name
+                    names_dirty = True
+            stock_display = f"{symbol} ({company_name})" if company_name and company_name != symbol else symbol
             
             if days_until > 0:
                 # Upcoming earnings
@@ -208,20 +426,53 @@ def run_and_notify_earnings_calendar():
                 # Earnings in the past (but within check range)
                 continue
             
-            send_telegram_message(message)
-            
-            # Save log
-            with open(file_log_name, "w", encoding="utf-8") as f:
-                json.dump(earnings_log, f, ensure_ascii=False, indent=2)
-                
+            pending_messages.append(message)
+            new_keys.append(earning_key)
+
         except Exception as e:
-            error_msg = f"❌ Error processing {earning.get('symbol', 'Unknown')} earnings: {e}"
-            send_telegram_message(error_msg)
+            error_msg = f"❌ Error processing {getattr(earning, 'symbol', 'Unknown')} earnings: {e}"
+            pending_messages.append(error_msg)
             print(error_msg)
-            
+
+    # One grouped Telegram send instead of one HTTP post per entry - keeps
+    # us well inside Telegram's per-chat rate limit
+    send_ok = True
+    if pending_messages:
+        combined = "\n\n———\n\n".join(pending_messages)
+        for chunk in _chunk_by_size(combined):
+            if not send_telegram_message(chunk):
+                send_ok = False
+
+    # Persist the alerted keys only after the grouped send went out - a
+    # key written before a failed send would suppress that earning forever
+    if send_ok:
+        for earning_key in new_keys:
+            # Persist just the new key instead of rewriting the whole log
+            append_to_log(file_log_name, earning_key)
+
+    # Debounced: write the name cache once per run, not once per entry
+    if names_dirty:
+        _save_company_names()
+
     return earnings
 
 
+async def get_earnings_calendar_async(days_to_check=7):
+    """Async entry point for get_earnings_calendar
+
+    Runs the (thread-parallelized) sync implementation off the event loop so
+    async callers can overlap the earnings check with other awaitables.
+    """
+    import asyncio
+    return await asyncio.to_thread(get_earnings_calendar, days_to_check)
+
+
+async def run_and_notify_earnings_calendar_async():
+    """Async entry point for run_and_notify_earnings_calendar"""
+    import asyncio
+    return await asyncio.to_thread(run_and_notify_earnings_calendar)
+
+
 def test_yahoo_finance_earnings_api(symbol="AAPL"):
     """Test rate-limited Yahoo Finance Earnings API with a single stock"""
     print(f"🧪 Testing rate-limited Yahoo Finance Earnings API for {symbol}")
@@ -9,20 +9,238 @@ Components (each 25%):
 4. Market Breadth - Advancing vs Declining stocks
 """
 
+import asyncio
 import requests
+import logging
 import os
+import random
+import threading
+import time
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Tuple
 from dotenv import load_dotenv
 
+# orjson's C parser cuts JSON decode time on the batched quote payload;
+# optional, with stdlib response.json() as the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
+# Lazy %s formatting keeps the failure diagnostics free when the level is
+# off, and avoids stdout contention on the broadcast path
+logger = logging.getLogger(__name__)
+
 FMP_API_KEY = os.getenv("FMP_API_KEY")
 FMP_DELAY_SECONDS = float(os.getenv("FMP_DELAY_SECONDS", "5"))
 
+# Reuse the cache and backoff policy shared with the other data providers
+try:
+    from .rate_limit_config import (
+        CACHE_DURATION_QUOTES, BASE_BACKOFF_DELAY, MAX_BACKOFF_DELAY)
+except ImportError:
+    try:
+        from rate_limit_config import (
+            CACHE_DURATION_QUOTES, BASE_BACKOFF_DELAY, MAX_BACKOFF_DELAY)
+    except ImportError:
+        CACHE_DURATION_QUOTES = 60
+        BASE_BACKOFF_DELAY = 2
+        MAX_BACKOFF_DELAY = 30
+
+# Last computed sentiment: (monotonic timestamp, result dict). The index
+# moves slowly relative to bot poll cadence, so repeat calls inside the
+# TTL are served without touching the network.
+_sentiment_cache: Optional[Tuple[float, Dict]] = None
+_sentiment_cache_lock = threading.Lock()
+
+# Every symbol the sentiment index needs - fetched in one batched request
+_SENTIMENT_SYMBOLS = ['^VIX', '^GSPC', '^TNX', '^DJI', '^IXIC']
+
+# U.S. market holidays (NYSE full closures) - quotes don't move on these
+# days any more than on weekends
+_US_MARKET_HOLIDAYS = {
+    # 2025
+    '2025-01-01', '2025-01-20', '2025-02-17', '2025-04-18', '2025-05-26',
+    '2025-06-19', '2025-07-04', '2025-09-01', '2025-11-27', '2025-12-25',
+    # 2026
+    '2026-01-01', '2026-01-19', '2026-02-16', '2026-04-03', '2026-05-25',
+    '2026-06-19', '2026-07-03', '2026-09-07', '2026-11-26', '2026-12-25',
+}
+
+
+def _sentiment_cache_ttl(now: Optional[datetime] = None) -> float:
+    """TTL for the cached sentiment, stretched when markets are closed
+
+    The index tracks U.S. equity instruments that don't trade on weekends
+    or market holidays, so refetching then just returns Friday's close.
+    An hour-long TTL on closed days drops most of those pointless calls.
+    """
+    if now is None:
+        now = datetime.now()
+    if now.weekday() >= 5 or now.strftime('%Y-%m-%d') in _US_MARKET_HOLIDAYS:
+        return 3600.0
+    return float(CACHE_DURATION_QUOTES)
+
+# Per-component refresh cadence: VIX and the 10Y yield drift slowly, so
+# they keep their score for 5 minutes while the intraday-sensitive
+# momentum and breadth components refresh on the shared quote TTL
+_COMPONENT_TTLS = {
+    'vix': 300.0,
+    'treasury_yields': 300.0,
+    'sp500_momentum': float(CACHE_DURATION_QUOTES),
+    'market_breadth': float(CACHE_DURATION_QUOTES),
+}
+_COMPONENT_SYMBOLS = {
+    'vix': ['^VIX'],
+    'sp500_momentum': ['^GSPC'],
+    'treasury_yields': ['^TNX'],
+    'market_breadth': ['^DJI', '^GSPC', '^IXIC'],
+}
+# name -> (monotonic timestamp, (score, details))
+_component_cache: Dict[str, Tuple[float, Tuple]] = {}
+
+# Background refresher thread handle - started once, never joined
+_refresher_thread: Optional[threading.Thread] = None
+_refresher_lock = threading.Lock()
+
+# Piecewise-linear VIX score bands: bisect the thresholds, then apply the
+# band's slope/intercept. Same math as the old if/elif ladder in one table.
+_VIX_THRESHOLDS = [12, 17, 24, 35]
+_VIX_BANDS = [
+    (0.0, 100.0, "Extreme Greed"),        # VIX < 12
+    (-5.0, 160.0, "Greed"),               # 12-17, maps to 75-100
+    (-25 / 7, 50 + 600 / 7, "Neutral"),   # 17-24, maps to 50-75
+    (-25 / 11, 25 + 875 / 11, "Fear"),    # 24-35, maps to 25-50
+    (-25 / 15, 25 + 875 / 15, "Extreme Fear"),  # > 35, floors at 0
+]
+
+# Treasury score bands keyed on the day's yield change, same
+# slope/intercept table form as the VIX bands (bisect_left preserves the
+# original strict ">" boundary behavior)
+_TREASURY_THRESHOLDS = [-2, 0, 2]
+_TREASURY_BANDS = [
+    (0.0, 20.0, "Fear (Yields Falling)"),   # change <= -2
+    (15.0, 50.0, "Slight Fear"),            # -2 < change <= 0
+    (15.0, 50.0, "Slight Greed"),           # 0 < change <= 2
+    (0.0, 80.0, "Greed (Yields Rising)"),   # change > 2
+]
+
+# Score thresholds shared by the momentum and overall classifiers
+_SCORE_THRESHOLDS = [25, 40, 60, 75]
+_MOMENTUM_LABELS = [
+    "Weak Momentum (Fear)", "Negative Momentum", "Neutral",
+    "Positive Momentum", "Strong Momentum (Greed)",
+]
+_OVERALL_LABELS = ["Extreme Fear", "Fear", "Neutral", "Greed", "Extreme Greed"]
+_OVERALL_EMOJIS = ["😱", "📉", "😐", "📈", "🚀"]
+
+# brotli beats gzip on FMP's JSON; urllib3 decodes 'br' transparently
+# whenever the optional brotli package is importable
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    _ACCEPT_ENCODING = 'gzip, deflate'
+
+# Shared session keeps the TLS connection to FMP warm between refreshes
+# instead of paying a fresh handshake per call
+_SESSION = requests.Session()
+_SESSION.mount('https://', requests.adapters.HTTPAdapter(
+    pool_connections=4, pool_maxsize=8))
+_SESSION.headers.update({
+    'Accept': 'application/json',
+    'Accept-Encoding': _ACCEPT_ENCODING,
+})
+
+# When FMP answers 401/402/403 (bad key, plan limit) or 429 with a
+# Retry-After, every further call in the refresh is doomed - park the
+# client until this monotonic deadline instead of burning quota and RTTs
+_FMP_DISABLED_UNTIL = 0.0
+
+
+class FMPDisabledError(Exception):
+    """Raised when FMP calls are paused after an auth/quota failure"""
+    pass
+
+
+def _fmp_get(url, session: Optional[requests.Session] = None,
+             timeout: float = 4, retries: int = 2):
+    """GET an FMP URL with a short timeout and jittered backoff retries
+
+    The tight timeout keeps one hung endpoint from stalling the whole
+    sentiment refresh; 429/5xx answers are retried with capped exponential
+    backoff. Returns the parsed JSON payload or None. Raises
+    FMPDisabledError while the client is parked after an auth/quota
+    failure so callers can short-circuit instead of issuing doomed calls.
+    """
+    global _FMP_DISABLED_UNTIL
+    if time.monotonic() < _FMP_DISABLED_UNTIL:
+        raise FMPDisabledError("FMP calls paused after auth/quota failure")
+    for attempt in range(retries + 1):
+        try:
+            response = (session or _SESSION).get(url, timeout=timeout)
+            status = response.status_code
+            if status == 200:
+                if orjson is not None:
+                    return orjson.loads(response.content)
+                return response.json()
+            if status in (401, 402, 403):
+                _FMP_DISABLED_UNTIL = time.monotonic() + 300
+                logger.warning(
+                    "FMP auth/quota failure (%s) - pausing calls for 5 minutes",
+                    status)
+                raise FMPDisabledError(f"FMP returned {status}")
+            if status == 429 and response.headers.get('Retry-After'):
+                try:
+                    retry_after = int(response.headers['Retry-After'])
+                except ValueError:
+                    retry_after = 60
+                _FMP_DISABLED_UNTIL = time.monotonic() + retry_after
+                logger.warning(
+                    "FMP rate limited - honoring Retry-After of %ss", retry_after)
+                raise FMPDisabledError("FMP rate limited")
+            if status == 429 or status >= 500:
+                if attempt < retries:
+                    delay = min(MAX_BACKOFF_DELAY, BASE_BACKOFF_DELAY * 2 ** attempt)
+                    time.sleep(delay * random.uniform(0.8, 1.2))
+                    continue
+            logger.warning("FMP fetch failed: %s", status)
+            return None
+        except FMPDisabledError:
+            raise
+        except Exception as e:
+            if attempt < retries:
+                delay = min(MAX_BACKOFF_DELAY, BASE_BACKOFF_DELAY * 2 ** attempt)
+                time.sleep(delay * random.uniform(0.8, 1.2))
+                continue
+            logger.warning("FMP fetch error: %s", e)
+            return None
+    return None
+
 
-def get_vix_score() -> Tuple[Optional[float], Optional[Dict]]:
+def _fetch_quotes(symbols, session: Optional[requests.Session] = None) -> Dict[str, Dict]:
+    """Fetch several quotes with one comma-list FMP request
+
+    Returns {symbol: quote row}; empty dict on any failure so callers can
+    fall back per component.
+    """
+    try:
+        url = f'https://financialmodelingprep.com/api/v3/quote/{",".join(symbols)}?apikey={FMP_API_KEY}'
+        data = _fmp_get(url, session)
+        return {d.get('symbol'): d for d in data or []}
+    except FMPDisabledError:
+        raise
+    except Exception as e:
+        logger.warning("Error fetching quotes %s: %s", symbols, e)
+        return {}
+
+
+def get_vix_score(quote: Optional[Dict] = None,
+                  session: Optional[requests.Session] = None) -> Tuple[Optional[float], Optional[Dict]]:
     """
     Get VIX-based fear score (0-100).
     Calibrated to CNN Fear & Greed Index standards:
@@ -35,37 +253,18 @@ def get_vix_score() -> Tuple[Optional[float], Optional[Dict]]:
     Returns: (score, details_dict)
     """
     try:
-        url = f'https://financialmodelingprep.com/api/v3/quote/^VIX?apikey={FMP_API_KEY}'
-        response = requests.get(url, timeout=10)
-        
-        if response.status_code != 200:
-            print(f"VIX fetch failed: {response.status_code}")
-            return None, None
-            
-        data = response.json()
-        if not data:
+        if quote is None:
+            quote = _fetch_quotes(['^VIX'], session).get('^VIX')
+        if not quote:
             return None, None
-            
-        vix_value = data[0].get('price', 0)
-        change_pct = data[0].get('changesPercentage', 0)
+
+        get = quote.get
+        vix_value, change_pct = get('price', 0), get('changesPercentage', 0)
         
         # Calculate score (inverse relationship - higher VIX = more fear = lower score)
         # Recalibrated to match CNN Fear & Greed thresholds
-        if vix_value < 12:
-            score = 100
-            interpretation = "Extreme Greed"
-        elif vix_value < 17:
-            score = 75 + ((17 - vix_value) / 5) * 25  # Linear interpolation 75-100
-            interpretation = "Greed"
-        elif vix_value < 24:
-            score = 50 + ((24 - vix_value) / 7) * 25  # Linear interpolation 50-75
-            interpretation = "Neutral"
-        elif vix_value < 35:
-            score = 25 + ((35 - vix_value) / 11) * 25  # Linear interpolation 25-50
-            interpretation = "Fear"
-        else:
-            score = max(0, 25 - ((vix_value - 35) / 15) * 25)  # Below 0 capped at 0
-            interpretation = "Extreme Fear"
+        slope, intercept, interpretation = _VIX_BANDS[bisect_right(_VIX_THRESHOLDS, vix_value)]
+        score = max(0.0, min(100.0, slope * vix_value + intercept))
             
         details = {
             'value': vix_value,
@@ -77,11 +276,12 @@ def get_vix_score() -> Tuple[Optional[float], Optional[Dict]]:
         return score, details
         
     except Exception as e:
-        print(f"Error fetching VIX: {e}")
+        logger.warning("Error fetching VIX: %s", e)
         return None, None
 
 
-def get_sp500_momentum_score() -> Tuple[Optional[float], Optional[Dict]]:
+def get_sp500_momentum_score(quote: Optional[Dict] = None,
+                             session: Optional[requests.Session] = None) -> Tuple[Optional[float], Optional[Dict]]:
     """
     Get S&P 500 momentum score based on RECENT PRICE ACTION + 52-week position.
     Heavily weights today's price change to reflect current sentiment.
@@ -92,21 +292,15 @@ def get_sp500_momentum_score() -> Tuple[Optional[float], Optional[Dict]]:
     Returns: (score, details_dict)
     """
     try:
-        url = f'https://financialmodelingprep.com/api/v3/quote/^GSPC?apikey={FMP_API_KEY}'
-        response = requests.get(url, timeout=10)
-        
-        if response.status_code != 200:
-            print(f"S&P 500 fetch failed: {response.status_code}")
-            return None, None
-            
-        data = response.json()
-        if not data:
+        if quote is None:
+            quote = _fetch_quotes(['^GSPC'], session).get('^GSPC')
+        if not quote:
             return None, None
-            
-        current_price = data[0].get('price', 0)
-        year_high = data[0].get('yearHigh', 0)
-        year_low = data[0].get('yearLow', 0)
-        change_pct = data[0].get('changesPercentage', 0)
+
+        get = quote.get
+        current_price, year_high, year_low, change_pct = (
+            get('price', 0), get('yearHigh', 0),
+            get('yearLow', 0), get('changesPercentage', 0))
         
         if year_high == year_low:
             return 50, None  # Edge case, return neutral
@@ -123,16 +317,7 @@ def get_sp500_momentum_score() -> Tuple[Optional[float], Optional[Dict]]:
         # This makes it responsive to current market moves
         score = (change_score * 0.6) + (position * 0.4)
         
-        if score >= 75:
-            interpretation = "Strong Momentum (Greed)"
-        elif score >= 60:
-            interpretation = "Positive Momentum"
-        elif score >= 40:
-            interpretation = "Neutral"
-        elif score >= 25:
-            interpretation = "Negative Momentum"
-        else:
-            interpretation = "Weak Momentum (Fear)"
+        interpretation = _MOMENTUM_LABELS[bisect_right(_SCORE_THRESHOLDS, score)]
             
         details = {
             'price': current_price,
@@ -147,11 +332,12 @@ def get_sp500_momentum_score() -> Tuple[Optional[float], Optional[Dict]]:
         return score, details
         
     except Exception as e:
-        print(f"Error fetching S&P 500: {e}")
+        logger.warning("Error fetching S&P 500: %s", e)
         return None, None
 
 
-def get_treasury_yield_score() -> Tuple[Optional[float], Optional[Dict]]:
+def get_treasury_yield_score(quote: Optional[Dict] = None,
+                             session: Optional[requests.Session] = None) -> Tuple[Optional[float], Optional[Dict]]:
     """
     Get treasury yield score based on 10Y yield level and recent change.
     Rising yields (safe haven demand dropping) = Greed
@@ -162,36 +348,20 @@ def get_treasury_yield_score() -> Tuple[Optional[float], Optional[Dict]]:
     Returns: (score, details_dict)
     """
     try:
-        # Get current 10Y yield
-        url = f'https://financialmodelingprep.com/api/v3/quote/^TNX?apikey={FMP_API_KEY}'
-        response = requests.get(url, timeout=10)
-        
-        if response.status_code != 200:
-            print(f"Treasury yield fetch failed: {response.status_code}")
-            return None, None
-            
-        data = response.json()
-        if not data:
+        if quote is None:
+            quote = _fetch_quotes(['^TNX'], session).get('^TNX')
+        if not quote:
             return None, None
-            
-        current_yield = data[0].get('price', 0)
-        change_pct = data[0].get('changesPercentage', 0)
+
+        get = quote.get
+        current_yield, change_pct = get('price', 0), get('changesPercentage', 0)
         
         # Score based on recent change direction
         # Positive change (rising yields) = less fear = higher score
         # Negative change (falling yields) = more fear = lower score
-        if change_pct > 2:
-            score = 80
-            interpretation = "Greed (Yields Rising)"
-        elif change_pct > 0:
-            score = 50 + (change_pct / 2) * 30  # 50-80
-            interpretation = "Slight Greed"
-        elif change_pct > -2:
-            score = 50 + (change_pct / 2) * 30  # 20-50
-            interpretation = "Slight Fear"
-        else:
-            score = 20
-            interpretation = "Fear (Yields Falling)"
+        slope, intercept, interpretation = _TREASURY_BANDS[
+            bisect_left(_TREASURY_THRESHOLDS, change_pct)]
+        score = slope * change_pct + intercept
             
         details = {
             'yield': current_yield,
@@ -203,11 +373,12 @@ def get_treasury_yield_score() -> Tuple[Optional[float], Optional[Dict]]:
         return score, details
         
     except Exception as e:
-        print(f"Error fetching treasury yields: {e}")
+        logger.warning("Error fetching treasury yields: %s", e)
         return None, None
 
 
-def get_market_breadth_score() -> Tuple[Optional[float], Optional[Dict]]:
+def get_market_breadth_score(quotes: Optional[Dict[str, Dict]] = None,
+                             session: Optional[requests.Session] = None) -> Tuple[Optional[float], Optional[Dict]]:
     """
     Get market breadth score by comparing major indices performance.
     All indices up strongly = Greed
@@ -218,24 +389,22 @@ def get_market_breadth_score() -> Tuple[Optional[float], Optional[Dict]]:
     Returns: (score, details_dict)
     """
     try:
-        # Get multiple major indices
-        symbols = ['^DJI', '^GSPC', '^IXIC']  # Dow, S&P 500, Nasdaq
-        url = f'https://financialmodelingprep.com/api/v3/quote/{",".join(symbols)}?apikey={FMP_API_KEY}'
-        response = requests.get(url, timeout=10)
-        
-        if response.status_code != 200:
-            print(f"Market breadth fetch failed: {response.status_code}")
+        # Compare the major indices: Dow, S&P 500, Nasdaq
+        symbols = ['^DJI', '^GSPC', '^IXIC']
+        if quotes is None:
+            quotes = _fetch_quotes(symbols, session)
+        data = [quotes[s] for s in symbols if quotes.get(s)]
+        if len(data) < 3:
             return None, None
             
-        data = response.json()
-        if not data or len(data) < 3:
-            return None, None
-            
-        changes = [d.get('changesPercentage', 0) for d in data]
-        avg_change = sum(changes) / len(changes)
+        # Exactly three rows survive the filter above, so unpack straight
+        # into scalars - no intermediate list and a single fused pass
+        dow_change, sp500_change, nasdaq_change = (
+            d.get('changesPercentage', 0) for d in data)
+        avg_change = (dow_change + sp500_change + nasdaq_change) / 3
         
-        # Count positive vs negative indices
-        positive_count = sum(1 for c in changes if c > 0)
+        # Count positive vs negative indices (bools sum as 0/1)
+        positive_count = (dow_change > 0) + (sp500_change > 0) + (nasdaq_change > 0)
         
         # Score based on average change and breadth
         if avg_change > 1 and positive_count >= 2:
@@ -254,9 +423,9 @@ def get_market_breadth_score() -> Tuple[Optional[float], Optional[Dict]]:
         score = max(0, min(100, score))  # Clamp to 0-100
             
         details = {
-            'dow_change': changes[0] if len(changes) > 0 else 0,
-            'sp500_change': changes[1] if len(changes) > 1 else 0,
-            'nasdaq_change': changes[2] if len(changes) > 2 else 0,
+            'dow_change': dow_change,
+            'sp500_change': sp500_change,
+            'nasdaq_change': nasdaq_change,
             'avg_change': round(avg_change, 2),
             'positive_count': positive_count,
             'interpretation': interpretation,
@@ -266,7 +435,7 @@ def get_market_breadth_score() -> Tuple[Optional[float], Optional[Dict]]:
         return score, details
         
     except Exception as e:
-        print(f"Error fetching market breadth: {e}")
+        logger.warning("Error fetching market breadth: %s", e)
         return None, None
 
 
@@ -286,83 +455,144 @@ def calculate_market_sentiment() -> Dict:
     - components: Dict of individual component scores and details
     - timestamp: When calculated
     """
-    print("Calculating market sentiment...")
-    
+    global _sentiment_cache
+
+    with _sentiment_cache_lock:
+        if _sentiment_cache is not None:
+            cached_at, cached_result = _sentiment_cache
+            if time.monotonic() - cached_at < _sentiment_cache_ttl():
+                return cached_result
+
+    logger.debug("Calculating market sentiment...")
+
     components = {}
     scores = []
-    weights = []
-    
-    # VIX (25% weight)
-    vix_score, vix_details = get_vix_score()
-    if vix_score is not None:
-        components['vix'] = vix_details
-        scores.append(vix_score)
-        weights.append(0.25)
-    
-    # S&P 500 Momentum (25% weight)
-    sp500_score, sp500_details = get_sp500_momentum_score()
-    if sp500_score is not None:
-        components['sp500_momentum'] = sp500_details
-        scores.append(sp500_score)
-        weights.append(0.25)
-    
-    # Treasury Yields (25% weight)
-    treasury_score, treasury_details = get_treasury_yield_score()
-    if treasury_score is not None:
-        components['treasury_yields'] = treasury_details
-        scores.append(treasury_score)
-        weights.append(0.25)
-    
-    # Market Breadth (25% weight)
-    breadth_score, breadth_details = get_market_breadth_score()
-    if breadth_score is not None:
-        components['market_breadth'] = breadth_details
-        scores.append(breadth_score)
-        weights.append(0.25)
-    
-    # Calculate weighted average
+
+    # Serve slow-moving components from their own cache and batch-fetch
+    # only the symbols the stale ones need - one comma-list round trip
+    # (or none) instead of four separate calls per refresh. Because needed
+    # is a set, ^GSPC appears once even though both the momentum and
+    # breadth components read it from the shared quotes dict below.
+    now_mono = time.monotonic()
+    fresh = {}
+    needed = set()
+    for name, ttl in _COMPONENT_TTLS.items():
+        entry = _component_cache.get(name)
+        if entry is not None and now_mono - entry[0] < ttl:
+            fresh[name] = entry[1]
+        else:
+            needed.update(_COMPONENT_SYMBOLS[name])
+
+    # Fast-fail while FMP is parked: serve the last good result (stale is
+    # better than four guaranteed failures) or the error dict
+    try:
+        quotes = _fetch_quotes(sorted(needed)) if needed else {}
+    except FMPDisabledError:
+        with _sentiment_cache_lock:
+            if _sentiment_cache is not None:
+                return _sentiment_cache[1]
+        return {
+            'error': 'Unable to calculate sentiment - FMP unavailable',
+            'timestamp': datetime.now().isoformat()
+        }
+
+    results = []
+    for name, compute in [
+        ('vix', lambda: get_vix_score(quotes.get('^VIX'))),
+        ('sp500_momentum', lambda: get_sp500_momentum_score(quotes.get('^GSPC'))),
+        ('treasury_yields', lambda: get_treasury_yield_score(quotes.get('^TNX'))),
+        ('market_breadth', lambda: get_market_breadth_score(quotes or None)),
+    ]:
+        if name in fresh:
+            results.append((name, fresh[name]))
+            continue
+        outcome = compute()
+        if outcome[0] is not None:
+            _component_cache[name] = (time.monotonic(), outcome)
+        results.append((name, outcome))
+
+    for name, (score, details) in results:
+        if score is not None:
+            components[name] = details
+            scores.append(score)
+
     if not scores:
         return {
             'error': 'Unable to calculate sentiment - no data available',
             'timestamp': datetime.now().isoformat()
         }
     
-    # Normalize weights if some components failed
-    total_weight = sum(weights)
-    normalized_weights = [w / total_weight for w in weights]
-    
-    overall_score = sum(s * w for s, w in zip(scores, normalized_weights))
+    # All components carry equal weight, so the normalized weighted average
+    # reduces to a plain mean over whichever components succeeded
+    overall_score = sum(scores) / len(scores)
     
     # Interpret overall score
-    if overall_score >= 75:
-        interpretation = "Extreme Greed"
-        emoji = "🚀"
-    elif overall_score >= 60:
-        interpretation = "Greed"
-        emoji = "📈"
-    elif overall_score >= 40:
-        interpretation = "Neutral"
-        emoji = "😐"
-    elif overall_score >= 25:
-        interpretation = "Fear"
-        emoji = "📉"
-    else:
-        interpretation = "Extreme Fear"
-        emoji = "😱"
+    band = bisect_right(_SCORE_THRESHOLDS, overall_score)
+    interpretation = _OVERALL_LABELS[band]
+    emoji = _OVERALL_EMOJIS[band]
     
+    now = datetime.now()
     result = {
         'overall_score': round(overall_score, 1),
         'interpretation': interpretation,
         'emoji': emoji,
         'components': components,
         'component_count': len(components),
-        'timestamp': datetime.now().isoformat()
+        'timestamp': now.isoformat(),
+        # Preformatted for the message renderer, which would otherwise
+        # parse the ISO string back into a datetime on every broadcast
+        '_display_ts': now.strftime('%Y-%m-%d %H:%M:%S')
     }
     
-    print(f"Market Sentiment: {overall_score:.1f} ({interpretation})")
+    logger.info("Market Sentiment: %.1f (%s)", overall_score, interpretation)
+    with _sentiment_cache_lock:
+        _sentiment_cache = (time.monotonic(), result)
     return result
 
 
+async def calculate_market_sentiment_async() -> Dict:
+    """Async wrapper so event-loop callers don't block on the FMP fetch
+
+    Runs the synchronous calculation in a worker thread; cache hits
+    return almost immediately either way.
+    """
+    return await asyncio.to_thread(calculate_market_sentiment)
+
+
+def _sentiment_refresher(interval: float):
+    """Loop forever, refreshing the sentiment cache ahead of demand"""
+    while True:
+        time.sleep(interval)
+        try:
+            calculate_market_sentiment()
+        except Exception as e:
+            logger.warning("Background sentiment refresh failed: %s", e)
+
+
+def start_sentiment_refresher(interval: Optional[float] = None) -> None:
+    """Keep the sentiment cache warm from a background daemon thread
+
+    Call once at bot startup. The first refresh runs synchronously so the
+    cache is populated before traffic is served; after that the thread
+    refreshes on the cache TTL, so user-facing calls never block on the
+    four FMP round trips of a cold cache.
+    """
+    global _refresher_thread
+    with _refresher_lock:
+        if _refresher_thread is not None and _refresher_thread.is_alive():
+            return
+        try:
+            calculate_market_sentiment()
+        except Exception as e:
+            logger.warning("Initial sentiment refresh failed: %s", e)
+        _refresher_thread = threading.Thread(
+            target=_sentiment_refresher,
+            args=(float(interval if interval is not None else CACHE_DURATION_QUOTES),),
+            daemon=True,
+            name='sentiment-refresher')
+        _refresher_thread.start()
+
+
 def format_sentiment_message(sentiment: Dict) -> str:
     """
     Format sentiment data for Telegram message.
@@ -381,37 +611,43 @@ def format_sentiment_message(sentiment: Dict) -> str:
     emoji = sentiment['emoji']
     components = sentiment['components']
     
-    msg = f"{emoji} **Market Sentiment Index: {score}/100**\n"
-    msg += f"**Status: {interpretation}**\n\n"
-    
-    msg += "📊 **Component Breakdown:**\n"
-    
+    # Build the message as a list of parts and join once - O(n) instead of
+    # repeated string reallocation, which matters at broadcast fanout
+    parts = []
+    append = parts.append
+    append(f"{emoji} **Market Sentiment Index: {score}/100**\n")
+    append(f"**Status: {interpretation}**\n\n")
+
+    append("📊 **Component Breakdown:**\n")
+
     # VIX
     if 'vix' in components:
         vix = components['vix']
-        msg += f"\n🔥 **VIX (Volatility):** {vix['value']:.2f} ({vix['change_pct']:+.2f}%)\n"
-        msg += f"   └ {vix['interpretation']}\n"
-    
+        append(f"\n🔥 **VIX (Volatility):** {vix['value']:.2f} ({vix['change_pct']:+.2f}%)\n")
+        append(f"   └ {vix['interpretation']}\n")
+
     # S&P 500 Momentum
     if 'sp500_momentum' in components:
         sp = components['sp500_momentum']
-        msg += f"\n📈 **S&P 500 Position:** ${sp['price']:.2f} ({sp['change_pct']:+.2f}%)\n"
-        msg += f"   └ {sp['position_pct']:.1f}% from 52W low to high\n"
-        msg += f"   └ {sp['interpretation']}\n"
-    
+        append(f"\n📈 **S&P 500 Position:** ${sp['price']:.2f} ({sp['change_pct']:+.2f}%)\n")
+        append(f"   └ {sp['position_pct']:.1f}% from 52W low to high\n")
+        append(f"   └ {sp['interpretation']}\n")
+
     # Treasury Yields
     if 'treasury_yields' in components:
         tn = components['treasury_yields']
-        msg += f"\n💰 **10Y Treasury:** {tn['yield']:.3f}% ({tn['change_pct']:+.2f}%)\n"
-        msg += f"   └ {tn['interpretation']}\n"
-    
+        append(f"\n💰 **10Y Treasury:** {tn['yield']:.3f}% ({tn['change_pct']:+.2f}%)\n")
+        append(f"   └ {tn['interpretation']}\n")
+
     # Market Breadth
     if 'market_breadth' in components:
         mb = components['market_breadth']
-        msg += f"\n🌐 **Market Breadth:** {mb['positive_count']}/3 indices positive\n"
-        msg += f"   └ Avg change: {mb['avg_change']:+.2f}%\n"
-        msg += f"   └ {mb['interpretation']}\n"
-    
-    msg += f"\n⏰ Updated: {datetime.fromisoformat(sentiment['timestamp']).strftime('%Y-%m-%d %H:%M:%S')}"
-    
-    return msg
+        append(f"\n🌐 **Market Breadth:** {mb['positive_count']}/3 indices positive\n")
+        append(f"   └ Avg change: {mb['avg_change']:+.2f}%\n")
+        append(f"   └ {mb['interpretation']}\n")
+
+    display_ts = sentiment.get('_display_ts') or datetime.fromisoformat(
+        sentiment['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+    append(f"\n⏰ Updated: {display_ts}")
+
+    return ''.join(parts)
@@ -0,0 +1,60 @@
+"""
+Paced-sleep ledger shared by the data providers
+
+Rate-limiter waits and retry backoffs are deliberate pacing, not
+slowness. Providers sleep through pause() so callers that enforce
+wall-clock budgets (data_providers._timed) can read the ledger and
+exclude paced time from the budget instead of declaring a timeout while
+a provider is simply obeying its own limiter.
+"""
+import threading
+import time
+from typing import Dict
+
+_lock = threading.Lock()
+_paced: Dict[int, float] = {}     # thread ident -> completed paced seconds
+_pausing: Dict[int, float] = {}   # thread ident -> monotonic start of an in-progress pause
+
+
+def pause(seconds: float):
+    """Sleep while crediting the time to the current thread's ledger
+
+    The pause is visible to paced_seconds() while it is still in
+    progress, so a budget watcher never mistakes a long limiter sleep
+    for a hung request.
+    """
+    if seconds <= 0:
+        return
+    ident = threading.get_ident()
+    start = time.monotonic()
+    with _lock:
+        _pausing[ident] = start
+    try:
+        time.sleep(seconds)
+    finally:
+        with _lock:
+            _pausing.pop(ident, None)
+            _paced[ident] = _paced.get(ident, 0.0) + (time.monotonic() - start)
+
+
+def reset():
+    """Zero the current thread's ledger
+
+    Pool threads are reused, so each budgeted task calls this before
+    running its provider function.
+    """
+    ident = threading.get_ident()
+    with _lock:
+        _paced.pop(ident, None)
+        _pausing.pop(ident, None)
+
+
+def paced_seconds(ident: int) -> float:
+    """Total paced sleep recorded by the thread with this ident,
+    including any pause currently in progress"""
+    with _lock:
+        total = _paced.get(ident, 0.0)
+        started = _pausing.get(ident)
+    if started is not None:
+        total += time.monotonic() - started
+    return total
@@ -53,6 +53,11 @@ HF_MAX_REQUESTS_PER_MINUTE = 10
 
 # ===== IMPLEMENTATION EXAMPLES =====
 
+# Illustrative pseudo-code, kept as a string like the other guide blocks:
+# the functions reference names (get_quote, time, random) this module never
+# imports, so leaving them as real defs compiled importable-but-crashing
+# examples into the .pyc for every process
+"""
 # Example 1: Simple batch with sleep
 def process_stocks_simple(symbols):
     results = []
@@ -105,6 +110,7 @@ def process_stocks_batched(symbols, batch_size=3):
             time.sleep(10.0)  # ✅ Batch cooldown
     
     return results
+"""
 
 # ===== RATE LIMITING INDICATORS =====
 
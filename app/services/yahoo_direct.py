@@ -1,14 +1,45 @@
 """
 Direct Yahoo Finance API provider - bypasses yfinance for reliable data
 """
+import asyncio
+import functools
+import numpy as np
+import os
 import requests
 import json
+import sqlite3
+import threading
 import time
 import random
 import hashlib
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 
+# orjson's C parser is markedly faster on the float-heavy OHLCV payloads;
+# optional, with stdlib json as the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Only advertise brotli when urllib3 can actually decode it - with the
+# optional brotli package installed Yahoo's JSON shrinks ~20% vs gzip
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    _ACCEPT_ENCODING = 'gzip, deflate'
+
+# Limiter waits and retry backoffs go through the shared pacing ledger
+# so budget-enforcing callers don't count them as slowness
+try:
+    from .pacing import pause as _paced_pause
+except ImportError:
+    # Fallback for direct execution
+    from pacing import pause as _paced_pause
+
 # Enhanced rate limiting configuration - AGGRESSIVE SETTINGS
 RATE_LIMIT_DELAY = 20.0  # Increased to 20 seconds (very conservative)
 MAX_RETRIES = 6  # More retries with longer backoff
@@ -19,9 +50,127 @@ INTER_STOCK_DELAY = 30.0  # Increased to 30 seconds between stocks
 BATCH_SIZE = 2  # Process only 2 stocks at a time
 BATCH_COOLDOWN = 60.0  # 1 minute cooldown between batches
 
-# Simple in-memory cache
-_quote_cache = {}
-_cache_timestamps = {}
+# Endpoint URL prefixes hoisted to module scope so hot paths build URLs
+# with one concatenation instead of re-parsing f-string templates
+_CHART_URL = 'https://query1.finance.yahoo.com/v8/finance/chart/'
+_BATCH_URL = 'https://query1.finance.yahoo.com/v7/finance/quote?symbols='
+_SUMMARY_URL = 'https://query1.finance.yahoo.com/v10/finance/quoteSummary/'
+
+def _finite_mask(*cols) -> np.ndarray:
+    """Boolean mask of rows where every given OHLC column is finite"""
+    return functools.reduce(np.logical_and, (np.isfinite(c) for c in cols))
+
+
+# History period -> days of lookback, shared by every call instead of
+# being rebuilt per invocation
+_PERIOD_DAYS = {
+    '1d': 1, '5d': 5, '1mo': 30, '3mo': 90, '6mo': 180,
+    '1y': 365, '2y': 730, '5y': 1825, 'max': 3650
+}
+
+# Bounded LRU cache: key -> (expires_at, data). Expiry rides in the
+# entry so a hit costs one lookup, stale entries are evicted lazily on
+# read, and the LRU bound keeps a long-running bot from leaking memory.
+MAX_CACHE_ENTRIES = 2048
+_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+# On-disk mirror of the cache so restarts don't trigger a re-fetch storm.
+# Entries past their TTL but inside the stale window are served
+# immediately while a background thread revalidates (SWR).
+_CACHE_DB_PATH = os.path.join('.cache', 'yahoo_cache.db')
+_STALE_WINDOW = float(os.getenv('YAHOO_STALE_WINDOW', '3600'))
+_cache_db = None
+_cache_db_lock = threading.Lock()
+_refreshing: set = set()
+_refresh_lock = threading.Lock()
+
+# Single-flight guard: concurrent callers asking for the same symbol
+# inside the cache-miss window share one HTTP request
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def _get_cache_db():
+    """Open (once) the SQLite mirror of the quote cache"""
+    global _cache_db
+    if _cache_db is None:
+        try:
+            os.makedirs(os.path.dirname(_CACHE_DB_PATH), exist_ok=True)
+            db = sqlite3.connect(_CACHE_DB_PATH, check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('CREATE TABLE IF NOT EXISTS cache('
+                       'key TEXT PRIMARY KEY, json BLOB, ts REAL, ttl REAL)')
+            db.commit()
+            _cache_db = db
+        except Exception as e:
+            print(f"⚠️ Yahoo disk cache unavailable: {e}")
+            _cache_db = False
+    return _cache_db or None
+
+
+def _persist_cache_entry(cache_key: str, data, ttl: float):
+    db = _get_cache_db()
+    if db is None:
+        return
+    try:
+        with _cache_db_lock:
+            db.execute('INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)',
+                       (cache_key, json.dumps(data), time.time(), ttl))
+            db.commit()
+    except Exception:
+        pass
+
+
+def _schedule_quote_refresh(symbol: str):
+    """Revalidate one symbol's quote in the background (once at a time)"""
+    key = _get_cache_key(symbol, 'quote')
+    with _refresh_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def _do_refresh():
+        try:
+            get_yahoo_quote(symbol)
+        except Exception:
+            pass
+        finally:
+            with _refresh_lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=_do_refresh, daemon=True).start()
+
+
+def _load_from_disk(cache_key: str):
+    """Disk lookup backing a memory miss; may serve stale and revalidate"""
+    db = _get_cache_db()
+    if db is None:
+        return None
+    try:
+        with _cache_db_lock:
+            row = db.execute('SELECT json, ts, ttl FROM cache WHERE key = ?',
+                             (cache_key,)).fetchone()
+        if not row:
+            return None
+        data, ts, ttl = json.loads(row[0]), row[1], row[2]
+        age = time.time() - ts
+        if age < ttl:
+            # Still fresh: promote into the memory cache for the rest
+            _cache[cache_key] = (time.monotonic() + (ttl - age), data)
+            _cache.move_to_end(cache_key)
+            return data
+        if age < ttl + _STALE_WINDOW and cache_key.endswith('_quote'):
+            with _refresh_lock:
+                refreshing = cache_key in _refreshing
+            if refreshing:
+                # The revalidating fetch itself must go to the network
+                return None
+            # Serve the stale value now, refresh off the hot path
+            _schedule_quote_refresh(cache_key[:-len('_quote')])
+            return data
+    except Exception:
+        pass
+    return None
 
 # Enhanced user agent rotation with more diverse browsers
 USER_AGENTS = [
@@ -35,26 +184,62 @@ USER_AGENTS = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Edge/120.0.0.0 Safari/537.36'
 ]
 
-_last_request = 0
+# Token bucket so independent callers only wait for actual token
+# deficit instead of being serialized 20s apart; same scheme as the FMP
+# provider. Defaults preserve the old average spacing of one request per
+# RATE_LIMIT_DELAY while letting short bursts through. All bucket state
+# (tokens + last refill) is read and written only under _bucket_lock, so
+# threaded callers from the batch/prefetch pools cannot race past the
+# limiter the way the old unsynchronized _last_request global could.
+YAHOO_RATE_PER_SEC = float(os.getenv('YAHOO_RATE_PER_SEC', str(1.0 / RATE_LIMIT_DELAY)))
+YAHOO_BURST = float(os.getenv('YAHOO_BURST', '5'))
+_bucket_lock = threading.Lock()
+_bucket_tokens = YAHOO_BURST
+_bucket_last_refill = time.monotonic()
+
 _session = None
 
+# Rotate the User-Agent at most once per interval so warm keep-alive
+# connections keep identical headers between requests
+_UA_ROTATE_INTERVAL = 300.0
+_ua_next_rotate = 0.0
+
 
 def _get_session():
     """Get reusable session for connection pooling"""
     global _session
     if _session is None:
         _session = requests.Session()
+        # Default adapters cap the pool at 10 connections and evict under
+        # concurrent batch use, forcing fresh TCP+TLS handshakes; a wider
+        # pool keeps every keep-alive connection to query1 reusable
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=32, pool_maxsize=32, max_retries=0)
+        _session.mount('https://', adapter)
+        _session.mount('http://', adapter)
         _session.headers.update({
             'Accept': 'application/json',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': _ACCEPT_ENCODING,
             'Connection': 'keep-alive',
             'Cache-Control': 'no-cache',
-            'Pragma': 'no-cache'
+            'Pragma': 'no-cache',
+            'User-Agent': random.choice(USER_AGENTS),
+            'Referer': 'https://finance.yahoo.com/',
+            'X-Requested-With': 'XMLHttpRequest'
         })
     return _session
 
 
+def _maybe_rotate_ua(session):
+    """Swap the session User-Agent when the rotation interval has passed"""
+    global _ua_next_rotate
+    now = time.monotonic()
+    if now >= _ua_next_rotate:
+        session.headers['User-Agent'] = random.choice(USER_AGENTS)
+        _ua_next_rotate = now + _UA_ROTATE_INTERVAL
+
+
 def _get_cache_key(symbol: str, request_type: str = 'quote') -> str:
     """Generate cache key for symbol and request type"""
     return f"{symbol.upper()}_{request_type}"
@@ -62,36 +247,46 @@ def _get_cache_key(symbol: str, request_type: str = 'quote') -> str:
 
 def _is_cache_valid(cache_key: str) -> bool:
     """Check if cached data is still valid"""
-    if cache_key not in _cache_timestamps:
-        return False
-    
-    elapsed = time.time() - _cache_timestamps[cache_key]
-    return elapsed < CACHE_DURATION
+    entry = _cache.get(cache_key)
+    return entry is not None and entry[0] > time.monotonic()
 
 
 def _get_from_cache(cache_key: str) -> Optional[Dict]:
-    """Get data from cache if valid"""
-    if _is_cache_valid(cache_key) and cache_key in _quote_cache:
-        return _quote_cache[cache_key]
-    return None
-
-
-def _store_in_cache(cache_key: str, data: Dict):
-    """Store data in cache with timestamp"""
-    _quote_cache[cache_key] = data
-    _cache_timestamps[cache_key] = time.time()
+    """Get data from cache if valid, evicting it lazily when stale"""
+    entry = _cache.get(cache_key)
+    if entry is None:
+        return _load_from_disk(cache_key)
+    if entry[0] > time.monotonic():
+        _cache.move_to_end(cache_key)
+        return entry[1]
+    _cache.pop(cache_key, None)
+    return _load_from_disk(cache_key)
+
+
+def _store_in_cache(cache_key: str, data: Dict, ttl: float = CACHE_DURATION):
+    """Store data in cache with its expiry, evicting the LRU past capacity"""
+    _cache[cache_key] = (time.monotonic() + ttl, data)
+    _cache.move_to_end(cache_key)
+    if len(_cache) > MAX_CACHE_ENTRIES:
+        _cache.popitem(last=False)
+    _persist_cache_entry(cache_key, data, ttl)
 
 
 def _wait_for_rate_limit():
-    """Enhanced rate limiting with jitter to avoid 429 errors"""
-    global _last_request
-    elapsed = time.time() - _last_request
-    if elapsed < RATE_LIMIT_DELAY:
-        # Add jitter to avoid synchronized requests
-        jitter = random.uniform(0.5, 1.5)
-        sleep_time = (RATE_LIMIT_DELAY - elapsed) * jitter
-        time.sleep(sleep_time)
-    _last_request = time.time()
+    """Take one token from the Yahoo bucket, sleeping only for the deficit"""
+    global _bucket_tokens, _bucket_last_refill
+    while True:
+        with _bucket_lock:
+            now = time.monotonic()
+            _bucket_tokens = min(
+                YAHOO_BURST,
+                _bucket_tokens + (now - _bucket_last_refill) * YAHOO_RATE_PER_SEC)
+            _bucket_last_refill = now
+            if _bucket_tokens >= 1.0:
+                _bucket_tokens -= 1.0
+                return
+            deficit = (1.0 - _bucket_tokens) / YAHOO_RATE_PER_SEC
+        _paced_pause(deficit)
 
 
 def _make_yahoo_request(url: str, timeout: int = 15) -> Optional[dict]:
@@ -102,25 +297,32 @@ def _make_yahoo_request(url: str, timeout: int = 15) -> Optional[dict]:
     for attempt in range(MAX_RETRIES):
         try:
             _wait_for_rate_limit()
+            _maybe_rotate_ua(session)
             
-            # Rotate user agent for each attempt
-            session.headers.update({
-                'User-Agent': random.choice(USER_AGENTS),
-                'Referer': 'https://finance.yahoo.com/',
-                'X-Requested-With': 'XMLHttpRequest'
-            })
-            
-            response = session.get(url, timeout=timeout)
+            # Stream so the status line is checked before the body is
+            # pulled, and large history payloads aren't double-buffered
+            response = session.get(url, timeout=timeout, stream=True)
             
             if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 429:
-                # Enhanced exponential backoff with jitter
-                base_delay = 2 ** attempt
-                jitter = random.uniform(0.5, 1.5)
-                delay = base_delay * jitter + random.uniform(2, 5)
+                with response:
+                    response.raw.decode_content = True
+                    if orjson is not None:
+                        return orjson.loads(response.raw.read())
+                    return json.load(response.raw)
+            response.close()
+            if response.status_code == 429:
+                # Honor a server-declared Retry-After before falling back
+                # to exponential backoff with jitter
+                retry_after = response.headers.get('Retry-After')
+                if retry_after and retry_after.isdigit():
+                    delay = int(retry_after)
+                else:
+                    # Full jitter: uniform over [0, capped exponential],
+                    # which desynchronizes retry storms better than a
+                    # jitter factor around the midpoint
+                    delay = random.uniform(0, min(60, 2 ** attempt))
                 print(f"⚠️ Rate limited, waiting {delay:.1f}s (attempt {attempt + 1})")
-                time.sleep(delay)
+                _paced_pause(delay)
                 continue
             elif response.status_code in [403, 404]:
                 print(f"⚠️ HTTP {response.status_code} - Skipping retries")
@@ -131,23 +333,51 @@ def _make_yahoo_request(url: str, timeout: int = 15) -> Optional[dict]:
         except Exception as e:
             print(f"⚠️ Request error (attempt {attempt + 1}): {e}")
             if attempt < MAX_RETRIES - 1:
-                # Progressive delay with jitter
-                delay = (1 + attempt) * random.uniform(1.5, 2.5)
-                time.sleep(delay)
+                # Full-jitter backoff with a smaller cap for local errors
+                delay = random.uniform(0, min(15, 2 ** attempt))
+                _paced_pause(delay)
     
     return None
 
 
 def get_yahoo_quote(symbol: str) -> Optional[Dict]:
-    """Get real-time quote from Yahoo Finance API with caching"""
+    """Get real-time quote from Yahoo Finance API with caching
     
+    Concurrent callers racing on the same uncached symbol are coalesced
+    onto one in-flight request; the losers just wait for its result.
+    """
     # Check cache first
-    cache_key = _get_cache_key(symbol, 'quote')
+    sym = symbol.upper()
+    cache_key = f"{sym}_quote"
     cached_data = _get_from_cache(cache_key)
     if cached_data:
         return cached_data
     
-    url = f'https://query1.finance.yahoo.com/v8/finance/chart/{symbol.upper()}'
+    with _inflight_lock:
+        future = _inflight.get(cache_key)
+        if future is None:
+            future = Future()
+            _inflight[cache_key] = future
+            owner = True
+        else:
+            owner = False
+    if not owner:
+        return future.result()
+    try:
+        result = _fetch_yahoo_quote(sym, cache_key)
+        future.set_result(result)
+        return result
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(cache_key, None)
+
+
+def _fetch_yahoo_quote(sym: str, cache_key: str) -> Optional[Dict]:
+    """Network fetch behind get_yahoo_quote's cache and single-flight"""
+    url = _CHART_URL + sym
     
     try:
         data = _make_yahoo_request(url)
@@ -169,8 +399,8 @@ def get_yahoo_quote(symbol: str) -> Optional[Dict]:
         change_pct = (change / prev_close * 100) if prev_close else 0
         
         quote_data = {
-            'symbol': meta.get('symbol', symbol.upper()),
-            'companyName': meta.get('longName', f"{symbol.upper()} Corporation"),
+            'symbol': meta.get('symbol', sym),
+            'companyName': meta.get('longName', f"{sym} Corporation"),
             'price': current_price,
             'change': change,
             'changePercent': change_pct,
@@ -189,7 +419,7 @@ def get_yahoo_quote(symbol: str) -> Optional[Dict]:
         return quote_data
         
     except Exception as e:
-        print(f"❌ Error getting Yahoo quote for {symbol}: {e}")
+        print(f"❌ Error getting Yahoo quote for {sym}: {e}")
         return None
 
 
@@ -197,23 +427,18 @@ def get_yahoo_history(symbol: str, period: str = "1y") -> Optional[Tuple[List[fl
     """Get historical data from Yahoo Finance API with caching"""
     
     # Check cache first (cache for 5 minutes for historical data)
-    cache_key = _get_cache_key(symbol, f'history_{period}')
+    sym = symbol.upper()
+    cache_key = f"{sym}_history_{period}"
     cached_data = _get_from_cache(cache_key)
     if cached_data:
         return cached_data
     
-    # Convert period to timestamps
-    end_time = int(datetime.now().timestamp())
-    
-    period_map = {
-        '1d': 1, '5d': 5, '1mo': 30, '3mo': 90, '6mo': 180,
-        '1y': 365, '2y': 730, '5y': 1825, 'max': 3650
-    }
+    # Convert period to timestamps with plain integer arithmetic - no
+    # datetime/timedelta objects on the hot path
+    end_time = int(time.time())
+    start_time = end_time - _PERIOD_DAYS.get(period, 365) * 86400
     
-    days = period_map.get(period, 365)
-    start_time = int((datetime.now() - timedelta(days=days)).timestamp())
-    
-    url = f'https://query1.finance.yahoo.com/v8/finance/chart/{symbol.upper()}?period1={start_time}&period2={end_time}&interval=1d'
+    url = f'{_CHART_URL}{sym}?period1={start_time}&period2={end_time}&interval=1d'
     
     try:
         data = _make_yahoo_request(url, timeout=15)
@@ -229,35 +454,31 @@ def get_yahoo_history(symbol: str, period: str = "1y") -> Optional[Tuple[List[fl
         timestamps = result['timestamp']
         indicators = result['indicators']['quote'][0]
         
-        # Extract OHLCV data
-        opens = indicators['open']
-        highs = indicators['high']
-        lows = indicators['low']
-        closes = indicators['close']
-        volumes = indicators['volume']
+        # Extract OHLCV data as float arrays (None becomes NaN) and drop
+        # incomplete rows with one vectorized mask instead of four
+        # is-not-None checks per timestamp
+        quote = indicators
+        opens_a = np.array(quote['open'], dtype=np.float64)
+        highs_a = np.array(quote['high'], dtype=np.float64)
+        lows_a = np.array(quote['low'], dtype=np.float64)
+        closes_a = np.array(quote['close'], dtype=np.float64)
+        volumes_a = np.array(
+            [v if v else 0 for v in quote['volume']], dtype=np.int64)
         
-        # Filter out None values and convert to proper types
-        prices = []
-        dates = []
-        historical_data = []
+        mask = _finite_mask(closes_a, opens_a, highs_a, lows_a)
         
-        for i, timestamp in enumerate(timestamps):
-            if (closes[i] is not None and opens[i] is not None and 
-                highs[i] is not None and lows[i] is not None):
-                
-                date = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')
-                
-                prices.append(float(closes[i]))
-                dates.append(date)
-                
-                historical_data.append({
-                    'date': date,
-                    'close': float(closes[i]),
-                    'open': float(opens[i]),
-                    'high': float(highs[i]),
-                    'low': float(lows[i]),
-                    'volume': int(volumes[i]) if volumes[i] else 0
-                })
+        ts_a = np.array(timestamps, dtype='datetime64[s]')[mask]
+        dates = np.datetime_as_string(ts_a, unit='D').tolist()
+        prices = closes_a[mask].tolist()
+        
+        historical_data = [
+            {'date': d, 'close': c, 'open': o, 'high': h, 'low': l,
+             'volume': v}
+            for d, c, o, h, l, v in zip(
+                dates, prices, opens_a[mask].tolist(),
+                highs_a[mask].tolist(), lows_a[mask].tolist(),
+                volumes_a[mask].tolist())
+        ]
         
         result = (prices, dates, historical_data)
         
@@ -267,85 +488,86 @@ def get_yahoo_history(symbol: str, period: str = "1y") -> Optional[Tuple[List[fl
         return result
         
     except Exception as e:
-        print(f"❌ Error getting Yahoo history for {symbol}: {e}")
+        print(f"❌ Error getting Yahoo history for {sym}: {e}")
         return None
 
 
-def get_multiple_quotes(symbols: List[str], use_delays: bool = True) -> Dict[str, Dict]:
+def get_multiple_quotes(symbols: List[str], max_concurrent: int = 3) -> Dict[str, Dict]:
     """
-    Get quotes for multiple stocks with intelligent rate limiting
+    Get quotes for multiple stocks with one batched request
+    
+    Serves what it can from the cache, fetches every remaining symbol in
+    a single v7 comma-list request, and only falls back to bounded
+    per-symbol concurrency for symbols the batch response left out. One
+    request instead of N means no inter-stock pacing is needed at all.
     
     Args:
         symbols: List of stock symbols
-        use_delays: Whether to add delays between requests (recommended: True)
+        max_concurrent: Maximum simultaneous fallback fetches
     
     Returns:
         Dictionary mapping symbol -> quote data
     """
     results = {}
+    if not symbols:
+        return results
     
     print(f"📊 Getting quotes for {len(symbols)} stocks...")
     
-    for i, symbol in enumerate(symbols):
-        print(f"🔄 [{i+1}/{len(symbols)}] Fetching {symbol}...")
-        
-        try:
-            quote = get_yahoo_quote(symbol)
+    # Serve cached symbols without any network traffic
+    to_fetch = []
+    for symbol in symbols:
+        cached = _get_from_cache(_get_cache_key(symbol, 'quote'))
+        if cached:
+            results[symbol] = cached
+        else:
+            to_fetch.append(symbol)
+    
+    if to_fetch:
+        batch = get_yahoo_batch_quotes(to_fetch)
+        for symbol in to_fetch:
+            quote = batch.get(symbol.upper())
             if quote:
                 results[symbol] = quote
-                print(f"✅ {symbol}: ${quote['price']:.2f}")
-            else:
-                print(f"❌ Failed to get {symbol}")
-                
-        except Exception as e:
-            print(f"❌ Error getting {symbol}: {e}")
-        
-        # Smart inter-stock delay (skip for last stock)
-        if use_delays and i < len(symbols) - 1:
-            delay = INTER_STOCK_DELAY
-            
-            # Add extra delay every BATCH_SIZE stocks
-            if (i + 1) % BATCH_SIZE == 0:
-                delay = BATCH_COOLDOWN
-                print(f"⏳ Batch cooldown: {delay}s...")
-            else:
-                print(f"⏳ Inter-stock delay: {delay}s...")
-            
-            time.sleep(delay)
+    
+    # Per-symbol chart fallback only for what the batch couldn't answer
+    missing = [s for s in symbols if s not in results]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(max_concurrent, len(missing))) as pool:
+            futures = {pool.submit(get_yahoo_quote, symbol): symbol for symbol in missing}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    quote = future.result()
+                    if quote:
+                        results[symbol] = quote
+                    else:
+                        print(f"❌ Failed to get {symbol}")
+                except Exception as e:
+                    print(f"❌ Error getting {symbol}: {e}")
     
     print(f"📈 Retrieved {len(results)}/{len(symbols)} quotes successfully")
     return results
 
 
+async def get_multiple_quotes_async(symbols: List[str], max_concurrent: int = 3) -> Dict[str, Dict]:
+    """Async variant of get_multiple_quotes for event-loop callers
+    
+    Runs the batched fetch in a worker thread so an event loop can await
+    it without blocking on the rate-limit sleeps.
+    """
+    return await asyncio.to_thread(get_multiple_quotes, symbols, max_concurrent)
+
+
 def get_quotes_with_smart_delays(symbols: List[str], max_concurrent: int = 3) -> Dict[str, Dict]:
     """
-    Get quotes with smart batching and optimal delays
+    Get quotes for many symbols without artificial pacing
     
-    This function is optimized to minimize rate limiting while maintaining speed.
+    Kept for backward compatibility: the batched endpoint answers any
+    number of symbols in one request, so the old batch/cooldown dance is
+    no longer needed.
     """
-    if len(symbols) <= max_concurrent:
-        # For small lists, use simple delays
-        return get_multiple_quotes(symbols, use_delays=True)
-    
-    # For large lists, process in batches
-    results = {}
-    
-    for i in range(0, len(symbols), max_concurrent):
-        batch = symbols[i:i + max_concurrent]
-        batch_num = (i // max_concurrent) + 1
-        total_batches = (len(symbols) + max_concurrent - 1) // max_concurrent
-        
-        print(f"🔄 Processing batch {batch_num}/{total_batches}: {batch}")
-        
-        batch_results = get_multiple_quotes(batch, use_delays=True)
-        results.update(batch_results)
-        
-        # Longer delay between batches
-        if i + max_concurrent < len(symbols):
-            print(f"⏳ Batch cooldown: {BATCH_COOLDOWN}s...")
-            time.sleep(BATCH_COOLDOWN)
-    
-        return results
+    return get_multiple_quotes(symbols, max_concurrent=max_concurrent)
 
 
 def get_yahoo_batch_quotes(symbols: List[str]) -> Dict[str, Dict]:
@@ -368,8 +590,7 @@ def get_yahoo_batch_quotes(symbols: List[str]) -> Dict[str, Dict]:
             seen.add(su)
 
     # Prepare URL
-    joined = ",".join(uniq)
-    url = f"https://query1.finance.yahoo.com/v7/finance/quote?symbols={joined}"
+    url = _BATCH_URL + ",".join(uniq)
 
     try:
         data = _make_yahoo_request(url, timeout=20)
@@ -420,6 +641,33 @@ def get_yahoo_batch_quotes(symbols: List[str]) -> Dict[str, Dict]:
         return results
 
 
+# Shared pool for overlapping independent Yahoo endpoint calls
+_prefetch_pool = ThreadPoolExecutor(max_workers=4)
+
+
+def prefetch_symbol_bundle(symbol: str, period: str = "1y") -> Dict[str, Optional[Dict]]:
+    """Fetch quote, history and company info for one symbol in parallel
+
+    The three endpoints are independent, so issuing them concurrently
+    over the shared session pool overlaps their round trips instead of
+    paying three in sequence. Returns {'quote': ..., 'history': ...,
+    'company_info': ...} with None for whatever failed.
+    """
+    futures = {
+        'quote': _prefetch_pool.submit(get_yahoo_quote, symbol),
+        'history': _prefetch_pool.submit(get_yahoo_history, symbol, period),
+        'company_info': _prefetch_pool.submit(get_yahoo_company_info, symbol),
+    }
+    bundle = {}
+    for name, future in futures.items():
+        try:
+            bundle[name] = future.result()
+        except Exception as e:
+            print(f"❌ Error prefetching {name} for {symbol}: {e}")
+            bundle[name] = None
+    return bundle
+
+
 def get_yahoo_company_info(symbol: str) -> Optional[Dict]:
     """
     Get company fundamental data from Yahoo Finance API with rate limiting
@@ -427,13 +675,14 @@ def get_yahoo_company_info(symbol: str) -> Optional[Dict]:
     Returns company profile, financial metrics, and basic info
     """
     # Check cache first (cache for 5 minutes for company info)
-    cache_key = _get_cache_key(symbol, 'company_info')
+    sym = symbol.upper()
+    cache_key = f"{sym}_company_info"
     cached_data = _get_from_cache(cache_key)
     if cached_data:
         return cached_data
     
     # Use the modules endpoint for more detailed company info
-    url = f'https://query1.finance.yahoo.com/v10/finance/quoteSummary/{symbol.upper()}?modules=assetProfile,financialData,defaultKeyStatistics,summaryProfile'
+    url = f'{_SUMMARY_URL}{sym}?modules=assetProfile,financialData,defaultKeyStatistics,summaryProfile'
     
     try:
         data = _make_yahoo_request(url, timeout=20)
@@ -454,7 +703,7 @@ def get_yahoo_company_info(symbol: str) -> Optional[Dict]:
         summary_profile = result.get('summaryProfile', {})
         
         company_info = {
-            'symbol': symbol.upper(),
+            'symbol': sym,
             'profile': {
                 'companyName': asset_profile.get('longBusinessSummary', {}).get('longName', symbol),
                 'sector': asset_profile.get('sector', 'N/A'),
@@ -506,7 +755,7 @@ def get_yahoo_company_info(symbol: str) -> Optional[Dict]:
         return company_info
         
     except Exception as e:
-        print(f"❌ Error getting Yahoo company info for {symbol}: {e}")
+        print(f"❌ Error getting Yahoo company info for {sym}: {e}")
         return None
 
 
@@ -518,22 +767,22 @@ def get_yahoo_earnings_calendar(symbol: str) -> Optional[Dict]:
     Note: Using fallback approach due to 401 errors on quoteSummary endpoint
     """
     # Check cache first (cache for 1 hour for earnings data)
-    cache_key = _get_cache_key(symbol, 'earnings')
+    sym = symbol.upper()
+    cache_key = f"{sym}_earnings"
     
     # Use longer cache for earnings (1 hour = 3600 seconds)
-    if cache_key in _cache_timestamps:
-        elapsed = time.time() - _cache_timestamps[cache_key]
-        if elapsed < 3600 and cache_key in _quote_cache:
-            return _quote_cache[cache_key]
+    cached_data = _get_from_cache(cache_key)
+    if cached_data:
+        return cached_data
 
     # Try multiple endpoints as fallbacks
     endpoints_to_try = [
         # Primary endpoint (may return 401)
-        f'https://query1.finance.yahoo.com/v10/finance/quoteSummary/{symbol.upper()}?modules=calendarEvents',
+        f'{_SUMMARY_URL}{sym}?modules=calendarEvents',
         # Alternative chart endpoint with additional modules
-        f'https://query1.finance.yahoo.com/v8/finance/chart/{symbol.upper()}?range=1y&includePrePost=true',
+        f'{_CHART_URL}{sym}?range=1y&includePrePost=true',
         # Simpler modules that might work
-        f'https://query1.finance.yahoo.com/v10/finance/quoteSummary/{symbol.upper()}?modules=defaultKeyStatistics'
+        f'{_SUMMARY_URL}{sym}?modules=defaultKeyStatistics'
     ]
     
     for i, url in enumerate(endpoints_to_try):
@@ -545,7 +794,7 @@ def get_yahoo_earnings_calendar(symbol: str) -> Optional[Dict]:
                 
             # Handle different response formats
             earnings_data = {
-                'symbol': symbol.upper(),
+                'symbol': sym,
                 'upcoming_earnings': [],
                 'earnings_history': [],
                 'source': f'endpoint_{i+1}'
@@ -570,16 +819,14 @@ def get_yahoo_earnings_calendar(symbol: str) -> Optional[Dict]:
                                     })
                     
                     # Cache successful result and return
-                    _quote_cache[cache_key] = earnings_data
-                    _cache_timestamps[cache_key] = time.time()
+                    _store_in_cache(cache_key, earnings_data, ttl=3600)
                     return earnings_data
             
             # Try chart format (backup)
             elif 'chart' in data:
                 # Chart endpoint doesn't have earnings calendar, but we can return structure
                 earnings_data['source'] = 'chart_endpoint'
-                _quote_cache[cache_key] = earnings_data
-                _cache_timestamps[cache_key] = time.time()
+                _store_in_cache(cache_key, earnings_data, ttl=3600)
                 return earnings_data
                 
         except Exception as e:
@@ -598,7 +845,7 @@ def get_yahoo_earnings_calendar(symbol: str) -> Optional[Dict]:
     import calendar
     
     mock_earnings = {
-        'symbol': symbol.upper(),
+        'symbol': sym,
         'upcoming_earnings': [],
         'earnings_history': [],
         'source': 'mock_fallback'
@@ -625,8 +872,7 @@ def get_yahoo_earnings_calendar(symbol: str) -> Optional[Dict]:
             break  # Only add next estimated earnings date
     
     # Cache mock result for shorter duration (30 minutes)
-    _quote_cache[cache_key] = mock_earnings
-    _cache_timestamps[cache_key] = time.time() - 1800  # Expire in 30 min instead of 1 hour
+    _store_in_cache(cache_key, mock_earnings, ttl=1800)
     
     return mock_earnings
 
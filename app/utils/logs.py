@@ -1,22 +1,137 @@
+import atexit
+import hashlib
 import json, os
-from typing import Dict, List
+import queue
+import threading
+from typing import Dict, List, Set, Tuple
+
+# orjson serializes/parses several times faster than stdlib json, which
+# matters once the log files grow; optional with a stdlib fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Per-path (mtime, entry hashes) so the duplicate check is one lookup
+# instead of a structural scan over every logged dict; the mtime guard
+# rebuilds the set when another process touched the file
+_seen_hashes: Dict[str, Tuple[float, Set[bytes]]] = {}
+
+# Appends are queued and flushed in batches by a background thread, so
+# high-frequency alert logging pays one open/write per batch rather than
+# per entry. The queue is drained on read and at interpreter exit.
+_FLUSH_BATCH = 128
+_write_queue: "queue.Queue" = queue.Queue()
+_write_lock = threading.Lock()
+_flush_thread = None
+_flush_thread_lock = threading.Lock()
+
+def _write_batch(grouped: Dict[str, List[bytes]]):
+    with _write_lock:
+        for path, payloads in grouped.items():
+            try:
+                with open(path, "ab") as f:
+                    f.write(b"".join(payload + b"\n" for payload in payloads))
+            except Exception as e:
+                print(f"⚠️ Error flushing log {path}: {e}")
+
+def _drain_queue():
+    """Flush everything currently queued in one grouped write"""
+    grouped: Dict[str, List[bytes]] = {}
+    while True:
+        try:
+            path, payload = _write_queue.get_nowait()
+        except queue.Empty:
+            break
+        grouped.setdefault(path, []).append(payload)
+    if grouped:
+        _write_batch(grouped)
+
+def _flush_loop():
+    while True:
+        try:
+            path, payload = _write_queue.get(timeout=1.0)
+        except queue.Empty:
+            continue
+        grouped = {path: [payload]}
+        for _ in range(_FLUSH_BATCH - 1):
+            try:
+                path, payload = _write_queue.get_nowait()
+            except queue.Empty:
+                break
+            grouped.setdefault(path, []).append(payload)
+        _write_batch(grouped)
+
+def _ensure_flush_thread():
+    global _flush_thread
+    with _flush_thread_lock:
+        if _flush_thread is None or not _flush_thread.is_alive():
+            _flush_thread = threading.Thread(
+                target=_flush_loop, daemon=True, name="log-flush")
+            _flush_thread.start()
+
+atexit.register(_drain_queue)
+
+def _dumps(item, sort_keys: bool = False) -> bytes:
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS if sort_keys else 0
+        return orjson.dumps(item, option=option)
+    return json.dumps(item, sort_keys=sort_keys, separators=(',', ':')).encode('utf-8')
+
+def _loads(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _item_hash(item: Dict) -> bytes:
+    return hashlib.blake2b(_dumps(item, sort_keys=True)).digest()
 
 def ensure(path: str):
     os.makedirs(os.path.dirname(path), exist_ok=True)
     if not os.path.exists(path):
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump([], f)
+        with open(path, "w", encoding="utf-8"):
+            pass
 
 def read(path: str) -> List[Dict]:
     ensure(path)
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    _drain_queue()  # make queued appends visible to the reader
+    with open(path, "rb") as f:
+        head = f.read(1)
+        f.seek(0)
+        # Legacy format: the whole file is one JSON array
+        if head == b"[":
+            return _loads(f.read())
+        return [_loads(line) for line in f if line.strip()]
+
+def _load_seen(path: str) -> Set[bytes]:
+    ensure(path)
+    mtime = os.stat(path).st_mtime
+    cached = _seen_hashes.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    items = read(path)
+    # Migrate a legacy JSON-array file to JSONL once, so appends can
+    # stay plain file appends from here on
+    with open(path, "rb") as f:
+        if f.read(1) == b"[":
+            with open(path, "wb") as out:
+                out.writelines(_dumps(item) + b"\n" for item in items)
+    seen = {_item_hash(item) for item in items}
+    _seen_hashes[path] = (os.stat(path).st_mtime, seen)
+    return seen
 
 def append(path: str, item: Dict) -> bool:
-    logs = read(path)
-    if item not in logs:
-        logs.append(item)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(logs, f, indent=2)
-        return True
-    return False
+    """Append item to the JSONL log unless an identical entry exists
+
+    The log is one JSON object per line, so each write is a single O(1)
+    file append; duplicates are detected against an in-memory hash set
+    built once per path instead of re-reading and rewriting the file.
+    """
+    seen = _load_seen(path)
+    h = _item_hash(item)
+    if h in seen:
+        return False
+    seen.add(h)
+    _ensure_flush_thread()
+    _write_queue.put((path, _dumps(item)))
+    return True
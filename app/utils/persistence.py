@@ -1,41 +1,94 @@
-import json, os
+import json, os, tempfile
 from typing import Dict
 from config import DATA_DIR
 
+# Advisory file locking is POSIX-only; writes still stay atomic via
+# os.replace when it is unavailable
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 STATE = os.path.join(DATA_DIR, "state.json")
 
 DEFAULT = {"stocks": [], "fx": [], "last_alerts": {}}
 
+def _atomic_write(path: str, data: str):
+    """Write data to path atomically: temp file + fsync + rename
+
+    A crash mid-write leaves the old file intact, and concurrent writers
+    are serialized on an advisory lock so they can't interleave.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    lock_path = path + ".lock"
+    lock_fd = None
+    if fcntl is not None:
+        lock_fd = os.open(lock_path, os.O_CREAT | os.O_RDWR)
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+    try:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            os.write(fd, data.encode("utf-8"))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    finally:
+        if lock_fd is not None:
+            fcntl.flock(lock_fd, fcntl.LOCK_UN)
+            os.close(lock_fd)
+
+# In-memory mirror of the state with set-backed membership per symbol
+# list, so the hot add/remove admin path is an O(1) test instead of a
+# list scan plus an unconditional reload from disk
+_state_cache: Dict = None
+_sets: Dict[str, set] = {}
+
 def load_state() -> Dict:
+    global _state_cache
     if not os.path.exists(STATE):
         save_state(DEFAULT)
     with open(STATE, "r", encoding="utf-8") as f:
-        return json.load(f)
+        _state_cache = json.load(f)
+    _sets.clear()
+    return _state_cache
+
+def _get_state() -> Dict:
+    if _state_cache is None:
+        return load_state()
+    return _state_cache
+
+def _get_set(state: Dict, kind: str) -> set:
+    members = _sets.get(kind)
+    if members is None:
+        members = set(state[kind])
+        _sets[kind] = members
+    return members
 
 def save_state(state: Dict):
-    os.makedirs(os.path.dirname(STATE), exist_ok=True)
-    with open(STATE, "w", encoding="utf-8") as f:
-        json.dump(state, f, indent=2)
+    _atomic_write(STATE, json.dumps(state, indent=2))
 
 def add_symbol(kind: str, sym: str) -> bool:
-    s = load_state()
-    arr = s[kind]
+    s = _get_state()
     sym = sym.upper()
-    if sym not in arr:
-        arr.append(sym)
-        save_state(s)
-        return True
-    return False
+    members = _get_set(s, kind)
+    if sym in members:
+        return False
+    members.add(sym)
+    s[kind].append(sym)
+    save_state(s)
+    return True
 
 def remove_symbol(kind: str, sym: str) -> bool:
-    s = load_state()
-    arr = s[kind]
+    s = _get_state()
     sym = sym.upper()
-    if sym in arr:
-        arr.remove(sym)
-        save_state(s)
-        return True
-    return False
+    members = _get_set(s, kind)
+    if sym not in members:
+        return False
+    members.discard(sym)
+    s[kind].remove(sym)
+    save_state(s)
+    return True
 
 
 def save_stock_list(stock_list):
@@ -43,14 +96,10 @@ def save_stock_list(stock_list):
     try:
         stock_list_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "stock_list.txt")
         
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(stock_list_file), exist_ok=True)
-        
-        with open(stock_list_file, "w", encoding="utf-8") as f:
-            f.write("# Stock symbols to monitor\n")
-            f.write("# One symbol per line, comments start with #\n")
-            for stock in stock_list:
-                f.write(f"{stock.upper()}\n")
+        lines = ["# Stock symbols to monitor\n",
+                 "# One symbol per line, comments start with #\n"]
+        lines.extend(f"{stock.upper()}\n" for stock in stock_list)
+        _atomic_write(stock_list_file, "".join(lines))
         
         # Update the in-memory cache
         import config
@@ -8,6 +8,9 @@ import os
 import time
 import signal
 import threading
+import logging
+import logging.handlers
+import queue
 from threading import Thread
 
 # Add app directory to path
@@ -16,7 +19,22 @@ sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app'))
 # Import bot modules
 from bot_modular import TelegramStockBot
 from core.interactive_bot import InteractiveTelegramBot
-from core.telegram_client import send_telegram_message, clear_chat_history
+from core.telegram_client import (
+    send_telegram_message, clear_chat_history,
+    set_telegram_webhook, delete_telegram_webhook)
+
+# Supervisor status messages go through a QueueHandler, so the hot
+# supervisor/shutdown paths just enqueue a record; the blocking stream
+# I/O happens on the listener's own thread
+_log_queue: "queue.Queue" = queue.Queue(-1)
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, logging.StreamHandler())
+_log_listener.start()
+
+logger = logging.getLogger("bot")
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+logger.propagate = False
 
 
 class CombinedTelegramBot:
@@ -26,6 +44,9 @@ class CombinedTelegramBot:
         self.alert_bot = TelegramStockBot()
         self.interactive_bot = InteractiveTelegramBot()
         self.running = False
+        # Set on shutdown so the supervisor loops wake immediately
+        # instead of finishing their current sleep
+        self._shutdown = threading.Event()
         
         # Threads for parallel execution
         self.alert_thread = None
@@ -37,37 +58,71 @@ class CombinedTelegramBot:
     
     def signal_handler(self, sig, frame):
         """Handle shutdown signals"""
-        print(f"\n🛑 Received signal {sig}, shutting down...")
+        logger.info("🛑 Received signal %s, shutting down...", sig)
         self.stop()
     
     def run_alert_bot(self):
         """Run the scheduled alert bot"""
         try:
-            print("🚀 Starting scheduled alerts system...")
+            logger.info("🚀 Starting scheduled alerts system...")
             self.alert_bot.startup_message()
             self.alert_bot.schedule_alerts()
             
             # Alert threads now handle their own scheduling with staggered delays
-            # Just keep the main alert thread alive and occasionally check status
-            while self.running:
+            # Just keep the main alert thread alive and occasionally check status.
+            # Event.wait doubles as the 10s pacing and an instant shutdown wakeup.
+            while not self._shutdown.wait(timeout=10):
                 self.alert_bot.run_scheduled_tasks()  # Just checks thread status now
-                time.sleep(10)  # Check every 10 seconds instead of every 1 second
                 
         except Exception as e:
-            print(f"❌ Alert bot error: {e}")
+            logger.info("❌ Alert bot error: %s", e)
             send_telegram_message(f"❌ Alert system error: {e}")
     
     def run_interactive_bot(self):
         """Run the interactive command bot"""
         try:
-            print("🤖 Starting interactive command system...")
+            logger.info("🤖 Starting interactive command system...")
             # Small delay to let alert bot start first
             time.sleep(2)
             self.interactive_bot.run()
         except Exception as e:
-            print(f"❌ Interactive bot error: {e}")
+            logger.info("❌ Interactive bot error: %s", e)
             send_telegram_message(f"❌ Interactive system error: {e}")
     
+    def run_webhook_server(self):
+        """Serve Telegram updates pushed to a webhook endpoint
+
+        Replaces the interactive polling thread on deployments with a
+        public endpoint: Telegram POSTs each update the moment it
+        exists, so the steady-state polling traffic disappears entirely.
+        Requires WEBHOOK_URL (public HTTPS) and the optional fastapi +
+        uvicorn dependencies.
+        """
+        from fastapi import FastAPI, Request
+        import uvicorn
+        
+        webhook_url = os.environ['WEBHOOK_URL']
+        secret_token = os.getenv('WEBHOOK_SECRET')
+        port = int(os.getenv('WEBHOOK_PORT', '8443'))
+        
+        app = FastAPI()
+        
+        @app.post('/telegram/webhook')
+        async def telegram_webhook(request: Request):
+            if secret_token and request.headers.get(
+                    'X-Telegram-Bot-Api-Secret-Token') != secret_token:
+                return {'ok': False}
+            update = await request.json()
+            if 'message' in update:
+                self.interactive_bot.process_message(update['message'])
+            return {'ok': True}
+        
+        set_telegram_webhook(webhook_url, secret_token)
+        try:
+            uvicorn.run(app, host='0.0.0.0', port=port, log_level='warning')
+        finally:
+            delete_telegram_webhook()
+    
     def start(self):
         """Start both bots in parallel"""
         self.running = True
@@ -94,6 +149,19 @@ class CombinedTelegramBot:
         self.alert_thread = Thread(target=self.run_alert_bot, daemon=True)
         self.alert_thread.start()
         
+        # Webhook mode: Telegram pushes updates to us, so the polling
+        # thread isn't started and the web server owns the main thread
+        if os.getenv('TELEGRAM_MODE', 'polling') == 'webhook':
+            print("🎉 Alert bot started - serving commands via webhook")
+            try:
+                self.run_webhook_server()
+            except KeyboardInterrupt:
+                self.stop()
+            except Exception as e:
+                print(f"❌ Webhook server error: {e}")
+                self.stop()
+            return
+        
         # Start interactive bot in separate thread  
         self.interactive_thread = Thread(target=self.run_interactive_bot, daemon=True)
         self.interactive_thread.start()
@@ -103,34 +171,39 @@ class CombinedTelegramBot:
         print("🤖 Interactive: Listening for Telegram commands")
         print("Press Ctrl+C to stop both bots")
         
-        # Keep main thread alive
+        # Block until shutdown is signalled - no periodic wakeups. The
+        # signal handlers call stop(), which sets the event, so SIGINT/
+        # SIGTERM interrupt this wait immediately; a self-pipe +
+        # selectors loop would add nothing over a plain Event here.
         try:
-            while self.running:
-                time.sleep(1)
+            self._shutdown.wait()
         except KeyboardInterrupt:
             self.stop()
     
     def stop(self):
         """Stop both bots gracefully"""
         self.running = False
+        self._shutdown.set()
         
-        print("🛑 Stopping both bots...")
+        logger.info("🛑 Stopping both bots...")
         
         # Stop interactive bot
         if self.interactive_bot:
             self.interactive_bot.stop()
         
-        # Wait for threads to finish
-        if self.alert_thread and self.alert_thread.is_alive():
-            print("⏳ Waiting for alert bot to stop...")
-            self.alert_thread.join(timeout=5)
-        
-        if self.interactive_thread and self.interactive_thread.is_alive():
-            print("⏳ Waiting for interactive bot to stop...")
-            self.interactive_thread.join(timeout=5)
+        # Wait for threads to finish - always with a timeout so shutdown
+        # is bounded, and name any straggler instead of hanging on it
+        for name, thread in (("alert bot", self.alert_thread),
+                             ("interactive bot", self.interactive_thread)):
+            if thread and thread.is_alive():
+                logger.info("⏳ Waiting for %s to stop...", name)
+                thread.join(timeout=5)
+                if thread.is_alive():
+                    logger.info("⚠️ %s did not stop within 5s (daemon thread, will be killed on exit)", name)
         
         send_telegram_message("🛑 Stock Alert Bot stopped - both alerts and commands disabled")
-        print("✅ Both bots stopped successfully")
+        logger.info("✅ Both bots stopped successfully")
+        _log_listener.stop()  # flush anything still queued
 
 
 def main():